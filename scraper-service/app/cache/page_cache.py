@@ -1,20 +1,56 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
 import asyncpg
+import orjson
 from cachetools import TTLCache
 
 logger = logging.getLogger(__name__)
 
+CACHE_FLUSH_INTERVAL_SECONDS = 0.05
+CACHE_FLUSH_BATCH_SIZE = 100
+
+_INSERT_PAGE = """
+    INSERT INTO scrape_parsed_page
+        (page_name, url, domain, scraped_at, expires_at, validity, content, char_count, content_type)
+    VALUES ($1, $2, $3, $4, $5, 'active', $6::jsonb, $7, $8)
+"""
+
+PageRow = tuple[str, str, str, datetime, datetime, str, int, str]
+
+
+def _row_to_entry(row: asyncpg.Record) -> dict[str, Any]:
+    content = row["content"]
+    if isinstance(content, str):
+        content = orjson.loads(content)
+    return {
+        "content": content,
+        "url": row["url"],
+        "domain": row["domain"],
+        "scraped_at": row["scraped_at"].isoformat() if row["scraped_at"] else None,
+        "content_type": row["content_type"],
+        "char_count": row["char_count"],
+    }
+
 
 class PageCache:
     def __init__(self, pool: asyncpg.Pool, max_size: int = 1000, ttl_seconds: int = 1800) -> None:
         self._pool = pool
         self._memory: TTLCache[str, dict[str, Any]] = TTLCache(maxsize=max_size, ttl=ttl_seconds)
+        self._pending: dict[str, PageRow] = {}
+        self._flush_now = asyncio.Event()
+        self._flusher: Optional[asyncio.Task[None]] = None
+        self._write_lock = asyncio.Lock()
+
+    async def stop(self) -> None:
+        if self._flusher and not self._flusher.done():
+            self._flush_now.set()
+            await self._flusher
+        await self._flush_pending()
 
     async def get(self, page_name: str) -> Optional[dict[str, Any]]:
         if page_name in self._memory:
@@ -30,17 +66,7 @@ class PageCache:
             """, page_name)
 
         if row:
-            content = row["content"]
-            if isinstance(content, str):
-                content = json.loads(content)
-            data = {
-                "content": content,
-                "url": row["url"],
-                "domain": row["domain"],
-                "scraped_at": row["scraped_at"].isoformat() if row["scraped_at"] else None,
-                "content_type": row["content_type"],
-                "char_count": row["char_count"],
-            }
+            data = _row_to_entry(row)
             self._memory[page_name] = data
             logger.debug("Cache HIT (db): %s", page_name)
             return data
@@ -48,6 +74,30 @@ class PageCache:
         logger.debug("Cache MISS: %s", page_name)
         return None
 
+    async def get_many(self, page_names: list[str]) -> dict[str, dict[str, Any]]:
+        found: dict[str, dict[str, Any]] = {}
+        missing: list[str] = []
+        for page_name in dict.fromkeys(page_names):
+            if page_name in self._memory:
+                found[page_name] = self._memory[page_name]
+            else:
+                missing.append(page_name)
+
+        if missing:
+            async with self._pool.acquire() as conn:
+                rows = await conn.fetch("""
+                    SELECT page_name, content, url, domain, scraped_at, content_type, char_count
+                    FROM scrape_parsed_page
+                    WHERE page_name = ANY($1::text[]) AND validity = 'active' AND expires_at > NOW()
+                """, missing)
+            for row in rows:
+                data = _row_to_entry(row)
+                self._memory[row["page_name"]] = data
+                found[row["page_name"]] = data
+
+        logger.debug("Cache batch: %d/%d hits", len(found), len(page_names))
+        return found
+
     async def set(
         self,
         page_name: str,
@@ -57,23 +107,23 @@ class PageCache:
         content_type: str,
         char_count: int,
         ttl_days: int = 30,
+        defer: bool = False,
     ) -> None:
         now = datetime.now(timezone.utc)
         expires_at = now + timedelta(days=ttl_days)
-        content_json = json.dumps(content, default=str)
+        content_json = orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        row = (page_name, url, domain, now, expires_at, content_json, char_count, content_type)
 
-        async with self._pool.acquire() as conn:
-            await conn.execute("""
-                UPDATE scrape_parsed_page
-                SET validity = 'stale'
-                WHERE page_name = $1 AND validity = 'active'
-            """, page_name)
-
-            await conn.execute("""
-                INSERT INTO scrape_parsed_page
-                    (page_name, url, domain, scraped_at, expires_at, validity, content, char_count, content_type)
-                VALUES ($1, $2, $3, $4, $5, 'active', $6::jsonb, $7, $8)
-            """, page_name, url, domain, now, expires_at, content_json, char_count, content_type)
+        if defer:
+            self._pending[page_name] = row
+            if len(self._pending) >= CACHE_FLUSH_BATCH_SIZE:
+                self._flush_now.set()
+            if self._flusher is None or self._flusher.done():
+                self._flusher = asyncio.create_task(self._flush_after_interval())
+        else:
+            async with self._write_lock:
+                self._pending.pop(page_name, None)
+                await self._write_rows([row])
 
         data = {
             "content": content,
@@ -86,11 +136,54 @@ class PageCache:
         self._memory[page_name] = data
         logger.debug("Cache SET: %s (expires %s)", page_name, expires_at.isoformat())
 
+    async def _flush_after_interval(self) -> None:
+        try:
+            await asyncio.wait_for(self._flush_now.wait(), CACHE_FLUSH_INTERVAL_SECONDS)
+        except TimeoutError:
+            pass
+        self._flush_now.clear()
+        await self._flush_pending()
+
+    async def _write_rows(self, rows: list[PageRow]) -> None:
+        async with self._pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute("""
+                    UPDATE scrape_parsed_page
+                    SET validity = 'stale'
+                    WHERE page_name = ANY($1::text[]) AND validity = 'active'
+                """, [row[0] for row in rows])
+                await conn.executemany(_INSERT_PAGE, rows)
+
+    async def _flush_pending(self) -> None:
+        while self._pending:
+            async with self._write_lock:
+                rows = list(self._pending.values())
+                self._pending.clear()
+                if rows:
+                    await self._write_batch(rows)
+
+    async def _write_batch(self, rows: list[PageRow]) -> None:
+        try:
+            await self._write_rows(rows)
+        except Exception:
+            if len(rows) == 1:
+                logger.exception("Failed to write cached page %s", rows[0][0])
+                return
+            logger.warning("Batch write of %d cached pages failed, retrying one by one", len(rows), exc_info=True)
+            for row in rows:
+                try:
+                    await self._write_rows([row])
+                except Exception:
+                    logger.exception("Failed to write cached page %s", row[0])
+
     async def invalidate(self, page_name: str) -> None:
         self._memory.pop(page_name, None)
-        async with self._pool.acquire() as conn:
-            await conn.execute("""
-                UPDATE scrape_parsed_page
-                SET validity = 'invalid'
-                WHERE page_name = $1 AND validity = 'active'
-            """, page_name)
+        # Waits for a batch already being written, so the page cannot come back as active after this.
+        async with self._write_lock:
+            self._pending.pop(page_name, None)
+            async with self._pool.acquire() as conn:
+                await conn.execute("""
+                    UPDATE scrape_parsed_page
+                    SET validity = 'invalid'
+                    WHERE page_name = $1 AND validity = 'active'
+                """, page_name)
@@ -27,6 +27,11 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    # Connections are only held for single cache/log queries, so the pool can stay well below
+    # the scrape concurrency; keep max >= MAX_SCRAPE_CONCURRENCY to avoid queueing behind
+    # connection waits. Starting point for Postgres: (cores * 2) + effective disk spindles.
+    DB_POOL_MIN_SIZE: int = 2
+    DB_POOL_MAX_SIZE: int = 20
 
     # Proxies (comma-separated)
     DATACENTER_PROXIES: str = ""
@@ -48,6 +53,9 @@ class Settings(BaseSettings):
     MAX_SCRAPE_CONCURRENCY: int = 20
     MAX_RESEARCH_CONCURRENCY: int = 30
 
+    # HTML/PDF/OCR parsing processes (0 = one per CPU)
+    PARSE_WORKERS: int = 0
+
     @property
     def datacenter_proxy_list(self) -> list[str]:
         return [p.strip() for p in self.DATACENTER_PROXIES.split(",") if p.strip()]
@@ -4,10 +4,27 @@ import asyncio
 import logging
 from typing import Optional
 
-from playwright.async_api import Browser, async_playwright, Playwright
+from playwright.async_api import Browser, async_playwright, Playwright, Route
 
 logger = logging.getLogger(__name__)
 
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+
+# Same output as page.content() + page.title() + page.url, in one round-trip.
+_PAGE_SNAPSHOT_JS = """() => {
+    let html = "";
+    if (document.doctype) html = new XMLSerializer().serializeToString(document.doctype);
+    if (document.documentElement) html += document.documentElement.outerHTML;
+    return {html, title: document.title, url: location.href};
+}"""
+
+
+async def _block_heavy_resources(route: Route) -> None:
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
 
 class PlaywrightBrowserPool:
     def __init__(self, pool_size: int = 3) -> None:
@@ -57,13 +74,15 @@ class PlaywrightBrowserPool:
                 context_kwargs["proxy"] = {"server": proxy}
 
             context = await browser.new_context(**context_kwargs)
+            await context.route("**/*", _block_heavy_resources)
             page = await context.new_page()
 
             try:
                 resp = await page.goto(url, timeout=timeout_ms, wait_until="domcontentloaded")
-                content = await page.content()
-                title = await page.title()
-                response_url = page.url
+                snapshot = await page.evaluate(_PAGE_SNAPSHOT_JS)
+                content = snapshot["html"]
+                title = snapshot["title"]
+                response_url = snapshot["url"]
                 status_code = resp.status if resp else 500
                 headers = await resp.all_headers() if resp else {}
             finally:
@@ -1,24 +1,29 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import random
 import re
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 from urllib.parse import urlparse
 
 import httpx
+import orjson
 from curl_cffi.requests import AsyncSession
 from httpx import Timeout
-from selectolax.parser import HTMLParser
+from selectolax.parser import HTMLParser, Node
 
 from app.config import Settings
 from app.core.fetcher.browser_pool import PlaywrightBrowserPool
 from app.core.fetcher.models import (
+    AMBIGUOUS_CONTENT_TYPES,
     CLOUDFLARE_RETRY_CSS_SELECTORS,
     EXTENSION_MAP,
+    LOW_TEXT_SKIP_TAGS,
+    MAX_PARSE_CHARS,
+    MODIFIED_META_KEYS,
+    PUBLISHED_META_KEYS,
     RETRY_CSS_SELECTORS,
     ROTATE_PROXY_ERRORS,
     URL_EXT_MAP,
@@ -37,23 +42,72 @@ from app.models.enums import (
 
 logger = logging.getLogger(__name__)
 
+_RE_HTML = re.compile(r"<html|<body|<head|<!doctype", re.I)
+_RE_WORDPRESS = re.compile(r"wp-content|wp-includes", re.I)
+_RE_SHOPIFY = re.compile(r"shopify", re.I)
+_RE_PROXY_ERROR = re.compile("|".join(re.escape(err) for err in ROTATE_PROXY_ERRORS))
+
 
 def _detect_content_type_from_url(url: str) -> Optional[ContentType]:
-    parsed = urlparse(url)
-    path_part = parsed.path.rstrip("/")
+    try:
+        path_part = urlparse(url).path.rstrip("/")
+    except ValueError:
+        return None
     ext = path_part.rsplit(".", 1)[-1].lower() if "." in path_part else ""
     return URL_EXT_MAP.get(ext)
 
 
+def _visible_text_length(body: Node, limit: int) -> int:
+    """Length of body.text(separator=" ", strip=True) without boilerplate tags; stops once it reaches limit."""
+    total = -1
+    stack = [body.child]
+    while stack:
+        node = stack.pop()
+        while node is not None:
+            tag = node.tag
+            if tag == "-text":
+                total += len((node.text_content or "").strip()) + 1
+                if total >= limit:
+                    return total
+            elif tag not in LOW_TEXT_SKIP_TAGS and node.child is not None:
+                stack.append(node.next)
+                node = node.child
+                continue
+            node = node.next
+    return max(total, 0)
+
+
+_RETRYABLE_REASONS = frozenset(
+    {FailureReason.REQUEST_ERROR.value, FailureReason.PROXY_ERROR.value, FailureReason.BAD_STATUS.value}
+)
+
+
 def _is_retryable_failure(response: FetchResponse) -> bool:
-    if not response.failed:
-        return False
-    retryable = {FailureReason.REQUEST_ERROR.value, FailureReason.PROXY_ERROR.value, FailureReason.BAD_STATUS.value}
-    for reason_dict in response.failed_reasons:
-        for key in reason_dict:
-            if key in retryable:
-                return True
-    return False
+    return response.failed and any(key in _RETRYABLE_REASONS for key, _ in response.failed_reasons)
+
+
+def _first_meta(meta_tags: dict[str, str], keys: tuple[str, ...]) -> Optional[str]:
+    for key in keys:
+        value = meta_tags.get(key)
+        if value:
+            return value
+    return None
+
+
+def _iter_ld_nodes(json_ld: list[Any]) -> Iterator[dict[str, Any]]:
+    """Top-level ld+json objects, their @graph items, and items of top-level arrays, in document order."""
+    for ld in json_ld:
+        if isinstance(ld, dict):
+            yield ld
+            graph = ld.get("@graph")
+            if isinstance(graph, list):
+                for item in graph:
+                    if isinstance(item, dict):
+                        yield item
+        elif isinstance(ld, list):
+            for item in ld:
+                if isinstance(item, dict):
+                    yield item
 
 
 def _to_iso(timestamp: Optional[str]) -> Optional[str]:
@@ -102,7 +156,7 @@ class UnifiedFetcher:
         headers: dict[str, str] = {}
         content_type_raw = ""
         failed = False
-        failed_reasons: list[dict[str, str]] = []
+        failed_reasons: list[tuple[str, str]] = []
         content_type = ContentType.OTHER
         extension = ""
         other_extensions: list[str] = []
@@ -111,6 +165,7 @@ class UnifiedFetcher:
         cms_primary: Optional[CMS] = None
         cms_other: list[CMS] = []
         firewall = Firewall.NONE
+        cloudflare_blocked = False
 
         url_hint = _detect_content_type_from_url(url)
         is_likely_binary = url_hint in BINARY_CONTENT_TYPES
@@ -125,10 +180,10 @@ class UnifiedFetcher:
                 if not header_profile:
                     header_profile = get_random_profile()
 
-                request_headers = header_profile["headers"].copy()
+                request_headers = header_profile["headers"]
 
                 if use_curl_cffi:
-                    impersonate = header_profile.get("impersonate", "chrome131")
+                    impersonate = header_profile["impersonate"]
                     async with AsyncSession(impersonate=impersonate) as session:
                         resp = await session.get(
                             url,
@@ -147,6 +202,9 @@ class UnifiedFetcher:
                             content = ""
                         else:
                             content = resp.text
+                            if content.startswith("%PDF-"):
+                                content_bytes = resp.content
+                                content = ""
                 else:
                     timeout_config = Timeout(15.0, connect=60.0)
                     client_kwargs: dict[str, Any] = {"timeout": timeout_config, "headers": request_headers}
@@ -165,17 +223,21 @@ class UnifiedFetcher:
                             content = ""
                         else:
                             content = resp.text
+                            if content.startswith("%PDF-"):
+                                content_bytes = resp.content
+                                content = ""
 
         except Exception as e:
             failed = True
-            failed_reasons.append({FailureReason.REQUEST_ERROR.value: str(e)})
-            if any(err in str(e) for err in ROTATE_PROXY_ERRORS):
-                failed_reasons.append({FailureReason.PROXY_ERROR.value: str(e)})
+            error_msg = str(e)
+            failed_reasons.append((FailureReason.REQUEST_ERROR.value, error_msg))
+            if _RE_PROXY_ERROR.search(error_msg):
+                failed_reasons.append((FailureReason.PROXY_ERROR.value, error_msg))
 
         ct_lower = content_type_raw.lower()
         is_html = False
-        if "text/html" in ct_lower:
-            if re.search(r"<html|<body|<head|<!doctype", content, re.I):
+        if "text/html" in ct_lower or "application/xhtml+xml" in ct_lower:
+            if _RE_HTML.search(content):
                 content_type = ContentType.HTML
                 is_html = True
             else:
@@ -183,7 +245,7 @@ class UnifiedFetcher:
         elif "text/markdown" in ct_lower or "text/x-markdown" in ct_lower:
             content_type = ContentType.MARKDOWN
         elif "application/pdf" in ct_lower:
-            if (content_bytes and content_bytes[:5] == b"%PDF-") or content.startswith("%PDF-"):
+            if content_bytes is not None and content_bytes.startswith(b"%PDF-"):
                 content_type = ContentType.PDF
             else:
                 content_type = ContentType.OTHER
@@ -196,9 +258,10 @@ class UnifiedFetcher:
         elif ct_lower.startswith("image/"):
             content_type = ContentType.IMAGE
         else:
-            if (content_bytes and content_bytes[:5] == b"%PDF-") or content.startswith("%PDF-"):
+            mime = ct_lower.split(";", 1)[0].strip()
+            if content_bytes is not None and content_bytes.startswith(b"%PDF-"):
                 content_type = ContentType.PDF
-            elif re.search(r"<html|<body|<head|<!doctype", content, re.I):
+            elif mime in AMBIGUOUS_CONTENT_TYPES and _RE_HTML.search(content):
                 content_type = ContentType.HTML
                 is_html = True
             elif url_hint:
@@ -219,10 +282,13 @@ class UnifiedFetcher:
         meta_tags: dict[str, str] = {}
         json_ld: list[Any] = []
         selectolax_tree: Optional[HTMLParser] = None
+        parse_truncated = is_html and len(content) > MAX_PARSE_CHARS
 
+        if parse_truncated:
+            logger.info("[FETCH] Parsing the first %d of %d chars for %s", MAX_PARSE_CHARS, len(content), url)
         if is_html and content:
             try:
-                selectolax_tree = HTMLParser(content)
+                selectolax_tree = HTMLParser(content[:MAX_PARSE_CHARS] if parse_truncated else content)
                 if title is None:
                     title_tag = selectolax_tree.css_first("title")
                     title = title_tag.text(strip=True) if title_tag else ""
@@ -234,31 +300,32 @@ class UnifiedFetcher:
                         meta_tags[name] = meta.attrs.get("content", "")
                 for script in selectolax_tree.css('script[type="application/ld+json"]'):
                     try:
-                        data = json.loads(script.text())
-                        json_ld.append(data)
-                    except json.JSONDecodeError:
+                        json_ld.append(orjson.loads(script.text()))
+                    except orjson.JSONDecodeError:
                         pass
             except Exception as e:
                 failed = True
-                failed_reasons.append({FailureReason.PARSE_ERROR.value: str(e)})
+                failed_reasons.append((FailureReason.PARSE_ERROR.value, str(e)))
 
         if status_code >= 400:
             failed = True
-            failed_reasons.append({FailureReason.BAD_STATUS.value: f"Status code {status_code}"})
+            failed_reasons.append((FailureReason.BAD_STATUS.value, f"Status code {status_code}"))
         if not is_html and content_type not in EXTRACTABLE_CONTENT_TYPES:
             failed = True
-            failed_reasons.append({FailureReason.NON_HTML_CONTENT.value: content_type_raw})
+            failed_reasons.append((FailureReason.NON_HTML_CONTENT.value, content_type_raw))
         if is_html and selectolax_tree:
             for selector in RETRY_CSS_SELECTORS:
                 if selectolax_tree.css_first(selector):
                     failed = True
                     if selector in CLOUDFLARE_RETRY_CSS_SELECTORS:
-                        failed_reasons.append({FailureReason.CLOUDFLARE_BLOCK.value: f"Selector: {selector}"})
+                        cloudflare_blocked = True
+                        failed_reasons.append((FailureReason.CLOUDFLARE_BLOCK.value, f"Selector: {selector}"))
                     else:
-                        failed_reasons.append({FailureReason.BLOCKED.value: f"Selector: {selector}"})
+                        failed_reasons.append((FailureReason.BLOCKED.value, f"Selector: {selector}"))
         if title and any(kw in title.lower() for kw in ("cloudflare", "attention required", "just a moment")):
             failed = True
-            failed_reasons.append({FailureReason.CLOUDFLARE_BLOCK.value: f"Title indicates block: {title}"})
+            cloudflare_blocked = True
+            failed_reasons.append((FailureReason.CLOUDFLARE_BLOCK.value, f"Title indicates block: {title}"))
 
         if is_html and selectolax_tree:
             generator = (meta_tags.get("generator") or "").lower()
@@ -266,31 +333,29 @@ class UnifiedFetcher:
                 cms_primary = CMS.WORDPRESS
             elif selectolax_tree.css_first('meta[content*="shopify"]'):
                 cms_primary = CMS.SHOPIFY
-            if re.search(r"wp-content|wp-includes", content, re.I):
+            if cms_primary != CMS.WORDPRESS and _RE_WORDPRESS.search(content):
                 if cms_primary is None:
                     cms_primary = CMS.WORDPRESS
-                elif cms_primary != CMS.WORDPRESS:
+                else:
                     cms_other.append(CMS.WORDPRESS)
-            if re.search(r"cdn\.shopify\.com|shopify", content, re.I):
+            if cms_primary != CMS.SHOPIFY and _RE_SHOPIFY.search(content):
                 if cms_primary is None:
                     cms_primary = CMS.SHOPIFY
-                elif cms_primary != CMS.SHOPIFY:
+                else:
                     cms_other.append(CMS.SHOPIFY)
             if cms_primary is None:
                 cms_primary = CMS.UNKNOWN
 
         if is_html and selectolax_tree:
-            body_copy = selectolax_tree.body
-            if body_copy:
-                for node in body_copy.css("nav, header, footer, script, noscript, style"):
-                    node.decompose()
-                text_content = body_copy.text(separator=" ", strip=True)
-                if len(text_content) < 100:
-                    failed_reasons.append({FailureReason.LOW_TEXT_CONTENT.value: f"Text length {len(text_content)}"})
+            body = selectolax_tree.body
+            if body:
+                text_length = _visible_text_length(body, limit=100)
+                if text_length < 100:
+                    failed_reasons.append((FailureReason.LOW_TEXT_CONTENT.value, f"Text length {text_length}"))
 
         if failed_reasons:
             failed = True
-            first_key = list(failed_reasons[0].keys())[0]
+            first_key = failed_reasons[0][0]
             try:
                 failed_primary_reason = FailureReason(first_key)
             except ValueError:
@@ -298,43 +363,23 @@ class UnifiedFetcher:
         else:
             failed_primary_reason = None
 
-        if "cf-ray" in headers or "cloudflare" in headers.get("server", "").lower():
+        server = headers.get("server", "").lower()
+        if cloudflare_blocked or "cf-ray" in headers or "cloudflare" in server:
             firewall = Firewall.CLOUDFLARE
-        elif "x-amzn-requestid" in headers and "aws" in headers.get("server", "").lower():
+        elif "x-amzn-requestid" in headers and "aws" in server:
             firewall = Firewall.AWS_WAF
-        if any(FailureReason.CLOUDFLARE_BLOCK.value in r for r in failed_reasons):
-            firewall = Firewall.CLOUDFLARE
         if any(k.startswith("x-datadome") for k in headers):
             firewall = Firewall.DATADOME
 
         if is_html:
-            published = (
-                meta_tags.get("article:published_time")
-                or meta_tags.get("og:article:published_time")
-                or meta_tags.get("datepublished")
-                or meta_tags.get("date")
-            )
-            modified = (
-                meta_tags.get("article:modified_time")
-                or meta_tags.get("og:article:modified_time")
-                or meta_tags.get("datemodified")
-                or meta_tags.get("last-modified")
-            )
+            published = _first_meta(meta_tags, PUBLISHED_META_KEYS)
+            modified = _first_meta(meta_tags, MODIFIED_META_KEYS)
             if not published or not modified:
-                for ld in json_ld:
-                    if isinstance(ld, dict):
-                        published = published or ld.get("datePublished")
-                        modified = modified or ld.get("dateModified")
-                        if "@graph" in ld:
-                            for item in ld["@graph"]:
-                                if isinstance(item, dict):
-                                    published = published or item.get("datePublished")
-                                    modified = modified or item.get("dateModified")
-                    elif isinstance(ld, list):
-                        for item in ld:
-                            if isinstance(item, dict):
-                                published = published or item.get("datePublished")
-                                modified = modified or item.get("dateModified")
+                for item in _iter_ld_nodes(json_ld):
+                    published = published or item.get("datePublished")
+                    modified = modified or item.get("dateModified")
+                    if published and modified:
+                        break
 
             published_at = _to_iso(published)
             modified_at = _to_iso(modified)
@@ -354,6 +399,7 @@ class UnifiedFetcher:
             failed=failed,
             failed_primary_reason=failed_primary_reason,
             failed_reasons=failed_reasons,
+            parse_truncated=parse_truncated,
             published_at=published_at,
             modified_at=modified_at,
             cms_primary=cms_primary,
@@ -395,11 +441,13 @@ class UnifiedFetcher:
         max_concurrency: int = 20,
         use_random_proxy: bool = True,
     ) -> list[FetchResponse]:
-        semaphore = asyncio.Semaphore(max_concurrency)
+        results: list[Optional[FetchResponse]] = [None] * len(urls)
+        pending = iter(enumerate(urls))
 
-        async def _bounded_fetch(url: str) -> FetchResponse:
-            async with semaphore:
-                return await self.fetch_with_retry(url, use_random_proxy=use_random_proxy)
+        async def _worker() -> None:
+            for i, url in pending:
+                results[i] = await self.fetch_with_retry(url, use_random_proxy=use_random_proxy)
 
-        tasks = [asyncio.create_task(_bounded_fetch(u)) for u in urls]
-        return list(await asyncio.gather(*tasks))
+        workers = [asyncio.create_task(_worker()) for _ in range(min(max_concurrency, len(urls)))]
+        await asyncio.gather(*workers)
+        return results  # type: ignore[return-value]
@@ -21,7 +21,8 @@ class FetchResponse(BaseModel):
     content_bytes: Optional[bytes] = Field(default=None, exclude=True)
     failed: bool = False
     failed_primary_reason: Optional[FailureReason] = None
-    failed_reasons: list[dict[str, str]] = Field(default_factory=list)
+    failed_reasons: list[tuple[str, str]] = Field(default_factory=list)
+    parse_truncated: bool = False
     published_at: Optional[str] = None
     modified_at: Optional[str] = None
     cms_primary: Optional[CMS] = None
@@ -53,6 +54,30 @@ ROTATE_PROXY_ERRORS: list[str] = [
     "TunnelUnsuccessful",
 ]
 
+AMBIGUOUS_CONTENT_TYPES: frozenset[str] = frozenset({
+    "",
+    "application/octet-stream",
+    "binary/octet-stream",
+})
+
+MAX_PARSE_CHARS: int = 8 * 1024 * 1024
+
+PUBLISHED_META_KEYS: tuple[str, ...] = (
+    "article:published_time",
+    "og:article:published_time",
+    "datepublished",
+    "date",
+)
+
+MODIFIED_META_KEYS: tuple[str, ...] = (
+    "article:modified_time",
+    "og:article:modified_time",
+    "datemodified",
+    "last-modified",
+)
+
+LOW_TEXT_SKIP_TAGS: frozenset[str] = frozenset({"nav", "header", "footer", "script", "noscript", "style"})
+
 URL_EXT_MAP: dict[str, ContentType] = {
     "pdf": ContentType.PDF,
     "json": ContentType.JSON,
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import random
+from types import MappingProxyType
 from typing import Any
 
 HEADER_PROFILES: list[dict[str, Any]] = [
@@ -64,5 +65,12 @@ HEADER_PROFILES: list[dict[str, Any]] = [
 ]
 
 
+# Headers are frozen once at import so profiles can be handed to the HTTP
+# clients as-is — both curl_cffi and httpx copy them into their own structures.
+for _profile in HEADER_PROFILES:
+    _profile["headers"] = MappingProxyType(dict(_profile["headers"]))
+del _profile
+
+
 def get_random_profile() -> dict[str, Any]:
-    return random.choice(HEADER_PROFILES).copy()
+    return random.choice(HEADER_PROFILES)
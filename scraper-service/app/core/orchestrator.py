@@ -3,7 +3,9 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
-from typing import Any, AsyncGenerator, Optional
+from concurrent.futures import Executor
+from datetime import datetime, timezone
+from typing import Any, AsyncGenerator, Callable, Optional, TypeVar
 
 import asyncpg
 
@@ -11,9 +13,9 @@ from app.cache.page_cache import PageCache
 from app.config import Settings
 from app.core.fetcher.fetcher import UnifiedFetcher
 from app.core.fetcher.models import FetchResponse
-from app.core.parser.parser import ParseResult, UnifiedParser
+from app.core.parser.parser import ParseResult, parse_html
 from app.core.search import BraveSearchClient, extract_urls_from_search_results
-from app.db.queries.failure_log import log_failure
+from app.db.queries.failure_log import FailureRow, build_failure_row, log_failures
 from app.db.queries.retry_queue import enqueue_retry
 from app.domain_config.config_store import DomainConfigStore
 from app.extractors.content_extractors import (
@@ -28,10 +30,59 @@ from app.models.responses import (
     ResearchPageEvent,
     ScrapeResult,
 )
-from app.utils.url import get_url_info, validate_and_correct_url
+from app.utils.url import URLInfo, get_url_info, validate_and_correct_url
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+FAILURE_FLUSH_INTERVAL_SECONDS = 0.2
+FAILURE_FLUSH_BATCH_SIZE = 500
+
+_EFFORT_LIMITS = {"low": 10, "medium": 25, "high": 50, "extreme": 100}
+
+_RESEARCH_FETCH_OPTIONS = FetchOptions(
+    use_cache=True,
+    output_mode=OutputMode.RESEARCH,
+    get_text_data=False,
+    get_organized_data=False,
+    get_links=False,
+    get_overview=False,
+    get_main_image=False,
+)
+
+
+def _format_failed_reasons(failed_reasons: list[tuple[str, str]]) -> str:
+    # Keeps the [{reason: message}, ...] text that error and error_log have always carried.
+    return str([{reason: message} for reason, message in failed_reasons])
+
+
+def _result_from_cache(url: str, cached: dict[str, Any]) -> ScrapeResult:
+    content = cached["content"]
+    content_type = cached.get("content_type")
+    ai_research_content = content.get("ai_research_content")
+    if ai_research_content is None and content_type != ContentType.HTML.value:
+        # Text extractions are cached once under text_data.
+        ai_research_content = content.get("text_data")
+    return ScrapeResult.model_construct(
+        status="success",
+        url=url,
+        from_cache=True,
+        scraped_at=cached.get("scraped_at"),
+        content_type=content_type,
+        text_data=content.get("text_data"),
+        organized_data=content.get("organized_data"),
+        overview=content.get("overview"),
+        ai_research_content=ai_research_content,
+        main_image=content.get("main_image"),
+        hashes=content.get("hashes"),
+        links=content.get("links"),
+    )
+
+
+def _join_research_content(scraped: list[tuple[str, str]]) -> str:
+    return "\n\n".join(f"--- {url} ---\n{content}" for url, content in scraped)
+
 
 class ScrapeOrchestrator:
     def __init__(
@@ -42,6 +93,7 @@ class ScrapeOrchestrator:
         page_cache: PageCache,
         domain_config_store: DomainConfigStore,
         search_client: Optional[BraveSearchClient] = None,
+        parse_executor: Optional[Executor] = None,
     ) -> None:
         self._fetcher = fetcher
         self._settings = settings
@@ -49,92 +101,161 @@ class ScrapeOrchestrator:
         self._cache = page_cache
         self._domain_config = domain_config_store
         self._search_client = search_client
-        self._parser = UnifiedParser()
+        self._parse_executor = parse_executor
+        self._failure_queue: asyncio.Queue[Optional[FailureRow]] = asyncio.Queue()
+        self._failure_flusher: Optional[asyncio.Task[None]] = None
+        self._scrape_semaphore = asyncio.Semaphore(settings.MAX_SCRAPE_CONCURRENCY)
+        self._research_semaphore = asyncio.Semaphore(settings.MAX_RESEARCH_CONCURRENCY)
+
+    async def stop(self) -> None:
+        if self._failure_flusher and not self._failure_flusher.done():
+            self._failure_queue.put_nowait(None)
+            await self._failure_flusher
+
+    def _queue_failure(self, row: FailureRow) -> None:
+        self._failure_queue.put_nowait(row)
+        if self._failure_flusher is None or self._failure_flusher.done():
+            self._failure_flusher = asyncio.create_task(self._flush_failures())
+
+    async def _flush_failures(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            row = await self._failure_queue.get()
+            if row is None:
+                return
+            rows = [row]
+            stopping = False
+            deadline = loop.time() + FAILURE_FLUSH_INTERVAL_SECONDS
+            while len(rows) < FAILURE_FLUSH_BATCH_SIZE:
+                try:
+                    row = await asyncio.wait_for(self._failure_queue.get(), deadline - loop.time())
+                except TimeoutError:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                rows.append(row)
+            await log_failures(self._pool, rows)
+            if stopping:
+                return
 
     async def scrape(self, urls: list[str], options: FetchOptions) -> list[ScrapeResult]:
-        semaphore = asyncio.Semaphore(self._settings.MAX_SCRAPE_CONCURRENCY)
-
-        async def _bounded(url: str) -> ScrapeResult:
-            async with semaphore:
-                return await self._scrape_single(url, options)
-
-        tasks = [asyncio.create_task(_bounded(u)) for u in urls]
-        return list(await asyncio.gather(*tasks))
+        results: list[Optional[ScrapeResult]] = [None] * len(urls)
+        pending: list[tuple[int, str, URLInfo]] = []
+        for i, raw_url in enumerate(urls):
+            resolved = self._resolve_url(raw_url)
+            if isinstance(resolved, ScrapeResult):
+                results[i] = resolved
+            else:
+                pending.append((i, *resolved))
+
+        if options.use_cache and pending:
+            cached = await self._cache.get_many([url_info.unique_page_name for _, _, url_info in pending])
+            misses: list[tuple[int, str, URLInfo]] = []
+            for i, url, url_info in pending:
+                entry = cached.get(url_info.unique_page_name)
+                if entry:
+                    results[i] = _result_from_cache(url, entry)
+                else:
+                    misses.append((i, url, url_info))
+            pending = misses
+
+        queued = iter(pending)
+
+        async def _worker() -> None:
+            for i, url, url_info in queued:
+                async with self._scrape_semaphore:
+                    results[i] = await self._fetch_and_process(url, url_info, options)
+
+        workers = min(self._settings.MAX_SCRAPE_CONCURRENCY, len(pending))
+        await asyncio.gather(*(_worker() for _ in range(workers)))
+        return results  # type: ignore[return-value]
 
     async def stream_scrape(self, urls: list[str], options: FetchOptions) -> AsyncGenerator[ScrapeResult, None]:
-        semaphore = asyncio.Semaphore(self._settings.MAX_SCRAPE_CONCURRENCY)
-        queue: asyncio.Queue[Optional[ScrapeResult]] = asyncio.Queue()
-
-        async def _worker(url: str) -> None:
-            async with semaphore:
-                result = await self._scrape_single(url, options)
-                await queue.put(result)
-
-        tasks = [asyncio.create_task(_worker(u)) for u in urls]
-
-        done_count = 0
-        total = len(urls)
-        while done_count < total:
-            result = await queue.get()
-            if result is not None:
-                done_count += 1
-                yield result
+        async for result in self._scrape_streaming(
+            urls, options, self._scrape_semaphore, self._settings.MAX_SCRAPE_CONCURRENCY
+        ):
+            yield result
 
-        await asyncio.gather(*tasks, return_exceptions=True)
+    async def _scrape_streaming(
+        self,
+        urls: list[str],
+        options: FetchOptions,
+        semaphore: asyncio.Semaphore,
+        max_concurrency: int,
+    ) -> AsyncGenerator[ScrapeResult, None]:
+        queued = iter(urls)
+        completed: asyncio.Queue[ScrapeResult | Exception] = asyncio.Queue()
+
+        async def _worker() -> None:
+            try:
+                for url in queued:
+                    async with semaphore:
+                        result = await self._scrape_single(url, options)
+                    completed.put_nowait(result)
+            except Exception as e:
+                completed.put_nowait(e)
+
+        workers = [asyncio.create_task(_worker()) for _ in range(min(max_concurrency, len(urls)))]
+        try:
+            for _ in urls:
+                result = await completed.get()
+                if isinstance(result, Exception):
+                    raise result
+                yield result
+        finally:
+            for worker in workers:
+                worker.cancel()
 
-    async def _scrape_single(self, raw_url: str, options: FetchOptions) -> ScrapeResult:
+    def _resolve_url(self, raw_url: str) -> tuple[str, URLInfo] | ScrapeResult:
         try:
             url = validate_and_correct_url(raw_url)
         except ValueError as e:
-            return ScrapeResult(status="error", url=raw_url, error=str(e))
-
-        if not self._domain_config.is_scrape_allowed(url):
-            return ScrapeResult(status="error", url=url, error="Domain scraping not allowed")
+            return ScrapeResult.model_construct(status="error", url=raw_url, error=str(e))
 
         url_info = get_url_info(url)
+        if not self._domain_config.is_scrape_allowed_domain(url_info.full_domain):
+            return ScrapeResult.model_construct(status="error", url=url, error="Domain scraping not allowed")
+
+        return url, url_info
+
+    async def _scrape_single(self, raw_url: str, options: FetchOptions) -> ScrapeResult:
+        resolved = self._resolve_url(raw_url)
+        if isinstance(resolved, ScrapeResult):
+            return resolved
+        url, url_info = resolved
 
         if options.use_cache:
             cached = await self._cache.get(url_info.unique_page_name)
             if cached:
-                content = cached["content"]
-                return ScrapeResult(
-                    status="success",
-                    url=url,
-                    from_cache=True,
-                    scraped_at=cached.get("scraped_at"),
-                    content_type=cached.get("content_type"),
-                    text_data=content.get("text_data"),
-                    organized_data=content.get("organized_data"),
-                    overview=content.get("overview"),
-                    ai_research_content=content.get("ai_research_content"),
-                    main_image=content.get("main_image"),
-                    hashes=content.get("hashes"),
-                    links=content.get("links"),
-                )
+                return _result_from_cache(url, cached)
+
+        return await self._fetch_and_process(url, url_info, options)
 
+    async def _fetch_and_process(self, url: str, url_info: URLInfo, options: FetchOptions) -> ScrapeResult:
         fetch_response = await self._fetcher.fetch_with_retry(url, use_random_proxy=True)
 
         if fetch_response.failed:
+            error = _format_failed_reasons(fetch_response.failed_reasons)
             primary_reason = fetch_response.failed_primary_reason
             if primary_reason:
-                await log_failure(
-                    pool=self._pool,
+                self._queue_failure(build_failure_row(
                     target_url=url,
                     failure_reason=primary_reason,
                     status_code=fetch_response.status_code,
-                    error_log=str(fetch_response.failed_reasons),
+                    error_log=error,
                     proxy_used=fetch_response.proxy_used,
-                )
+                ))
                 await enqueue_retry(
                     pool=self._pool,
                     target_url=url,
                     failure_reason=primary_reason.value,
                     tier="desktop",
                 )
-            return ScrapeResult(
+            return ScrapeResult.model_construct(
                 status="error",
                 url=url,
-                error=str(fetch_response.failed_reasons),
+                error=error,
                 status_code=fetch_response.status_code,
                 cms=fetch_response.cms_primary.value if fetch_response.cms_primary else None,
                 firewall=fetch_response.firewall.value,
@@ -142,6 +263,11 @@ class ScrapeOrchestrator:
 
         return await self._process_fetch_response(fetch_response, url, url_info, options)
 
+    async def _run_cpu_bound(self, func: Callable[..., T], *args: Any) -> T:
+        if self._parse_executor is None:
+            return await asyncio.to_thread(func, *args)
+        return await asyncio.get_running_loop().run_in_executor(self._parse_executor, func, *args)
+
     async def _process_fetch_response(
         self,
         resp: FetchResponse,
@@ -152,30 +278,24 @@ class ScrapeOrchestrator:
         ct = resp.content_type
 
         if ct == ContentType.HTML:
-            output_mode = options.output_mode
-            parse_result = await asyncio.to_thread(
-                self._parser.parse,
-                resp.content,
-                url,
-                OutputMode(output_mode),
-            )
+            parse_result = await self._run_cpu_bound(parse_html, resp.content, url, options.output_mode)
             return await self._build_result_from_parse(parse_result, resp, url, url_info, options)
 
         elif ct == ContentType.PDF:
-            pdf_bytes = resp.content_bytes or resp.content.encode("utf-8", errors="replace")
-            text = await asyncio.to_thread(extract_text_from_pdf_bytes, pdf_bytes)
+            pdf_bytes = resp.content_bytes
+            text = await self._run_cpu_bound(extract_text_from_pdf_bytes, pdf_bytes) if pdf_bytes else None
             return await self._build_text_result(text, resp, url, url_info, options)
 
         elif ct == ContentType.IMAGE:
             image_bytes = resp.content_bytes
-            text = await asyncio.to_thread(extract_text_from_image_bytes, image_bytes) if image_bytes else None
+            text = await self._run_cpu_bound(extract_text_from_image_bytes, image_bytes) if image_bytes else None
             return await self._build_text_result(text, resp, url, url_info, options)
 
         elif ct in (ContentType.JSON, ContentType.XML, ContentType.MARKDOWN, ContentType.PLAIN_TEXT):
             text = extract_text_content(resp.content, ct.value)
             return await self._build_text_result(text, resp, url, url_info, options)
 
-        return ScrapeResult(
+        return ScrapeResult.model_construct(
             status="error",
             url=url,
             error=f"Unsupported content type: {ct.value}",
@@ -191,8 +311,7 @@ class ScrapeOrchestrator:
         url_info: Any,
         options: FetchOptions,
     ) -> ScrapeResult:
-        import datetime
-        scraped_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        scraped_at = datetime.now(timezone.utc).isoformat()
         text_data = parse_result.text_data or parse_result.ai_research_content or ""
 
         cache_content: dict[str, Any] = {}
@@ -218,9 +337,10 @@ class ScrapeOrchestrator:
                 content_type=ContentType.HTML.value,
                 char_count=len(text_data),
                 ttl_days=options.cache_ttl_days,
+                defer=True,
             )
 
-        return ScrapeResult(
+        return ScrapeResult.model_construct(
             status="success",
             url=url,
             scraped_at=scraped_at,
@@ -245,11 +365,10 @@ class ScrapeOrchestrator:
         url_info: Any,
         options: FetchOptions,
     ) -> ScrapeResult:
-        import datetime
-        scraped_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        scraped_at = datetime.now(timezone.utc).isoformat()
 
         if not text:
-            return ScrapeResult(
+            return ScrapeResult.model_construct(
                 status="error",
                 url=url,
                 error="No extractable text content",
@@ -262,13 +381,14 @@ class ScrapeOrchestrator:
                 page_name=url_info.unique_page_name,
                 url=url,
                 domain=url_info.full_domain,
-                content={"text_data": text, "ai_research_content": text},
+                content={"text_data": text},
                 content_type=resp.content_type.value,
                 char_count=len(text),
                 ttl_days=options.cache_ttl_days,
+                defer=True,
             )
 
-        return ScrapeResult(
+        return ScrapeResult.model_construct(
             status="success",
             url=url,
             scraped_at=scraped_at,
@@ -290,8 +410,7 @@ class ScrapeOrchestrator:
             raise RuntimeError("Search client not configured")
 
         start_time = time.time()
-        effort_limits = {"low": 10, "medium": 25, "high": 50, "extreme": 100}
-        max_urls = effort_limits.get(effort, 100)
+        max_urls = _EFFORT_LIMITS.get(effort, 100)
 
         search_results = await self._search_client.search_with_retry(
             query=query, count=20, country=country, extra_snippets=True,
@@ -301,37 +420,15 @@ class ScrapeOrchestrator:
         url_entries = extract_urls_from_search_results([(query, search_results)])
         urls_to_scrape = [e["url"] for e in url_entries[:max_urls]]
 
-        options = FetchOptions(
-            use_cache=True,
-            output_mode=OutputMode.RESEARCH,
-            get_text_data=False,
-            get_organized_data=False,
-            get_links=False,
-            get_overview=False,
-            get_main_image=False,
-        )
-
-        scraped_count = 0
-        all_content: list[str] = []
-
-        semaphore = asyncio.Semaphore(self._settings.MAX_RESEARCH_CONCURRENCY)
-        queue: asyncio.Queue[Optional[ScrapeResult]] = asyncio.Queue()
+        scraped: list[tuple[str, str]] = []
 
-        async def _worker(url: str) -> None:
-            async with semaphore:
-                result = await self._scrape_single(url, options)
-                await queue.put(result)
-
-        tasks = [asyncio.create_task(_worker(u)) for u in urls_to_scrape]
-
-        done_count = 0
         total = len(urls_to_scrape)
-        while done_count < total:
-            result = await queue.get()
-            done_count += 1
-            if result is None:
-                continue
-
+        async for result in self._scrape_streaming(
+            urls_to_scrape,
+            _RESEARCH_FETCH_OPTIONS,
+            self._research_semaphore,
+            self._settings.MAX_RESEARCH_CONCURRENCY,
+        ):
             content = result.ai_research_content or result.text_data
             event = ResearchPageEvent(
                 url=result.url,
@@ -342,15 +439,13 @@ class ScrapeOrchestrator:
             yield event
 
             if content:
-                scraped_count += 1
-                all_content.append(f"--- {result.url} ---\n{content}")
-
-        await asyncio.gather(*tasks, return_exceptions=True)
+                scraped.append((result.url, content))
 
+        text_content = await asyncio.to_thread(_join_research_content, scraped)
         elapsed_ms = (time.time() - start_time) * 1000
         yield ResearchDoneEvent(
             total_urls=total,
-            scraped=scraped_count,
-            text_content="\n\n".join(all_content),
+            scraped=len(scraped),
+            text_content=text_content,
             execution_time_ms=elapsed_ms,
         )
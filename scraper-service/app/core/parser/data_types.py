@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import copy
 from collections import defaultdict
-from typing import Any, Optional, Union
+from dataclasses import dataclass, field
+from typing import Any, Callable, ClassVar, Optional, Union
 
-from pydantic import BaseModel, Field
 from tabulate import tabulate
 
 ContentUnion = Union[
@@ -19,9 +20,42 @@ ContentUnion = Union[
 ]
 
 
-class ElementMetadata(BaseModel):
+# Characters that can make up a value tabulate would parse as a number or bool.
+_NUMERIC_CHARS = frozenset("0123456789+-.,_ eEiInNfFtTyYaArRuUlLsS")
+
+_HEADER_PREFIXES = tuple("#" * level + " " for level in range(7))
+
+
+def _is_plain_cell(value: str) -> bool:
+    return value.isascii() and value.isprintable() and value == value.strip()
+
+
+def _format_text_table(rows: list[dict[str, str]], with_rule: bool) -> Optional[str]:
+    """Left-aligned 'simple'/'plain' table, or None when tabulate's number handling could apply."""
+    headers = list(rows[0])
+    columns: list[list[str]] = []
+    for header in headers:
+        column = [row[header].strip() for row in rows]
+        if not _is_plain_cell(header) or not all(_is_plain_cell(value) for value in column):
+            return None
+        filled = [value for value in column if value]
+        if filled and all(_NUMERIC_CHARS.issuperset(value) for value in filled):
+            return None
+        columns.append(column)
+
+    widths = [max(len(header) + 2, *map(len, column)) for header, column in zip(headers, columns)]
+    lines = ["  ".join(header.ljust(width) for header, width in zip(headers, widths)).rstrip()]
+    if with_rule:
+        lines.append("  ".join("-" * width for width in widths))
+    for values in zip(*columns):
+        lines.append("  ".join(value.ljust(width) for value, width in zip(values, widths)).rstrip())
+    return "\n".join(lines)
+
+
+@dataclass(slots=True)
+class ElementMetadata:
     tag: Optional[str] = None
-    attributes: dict[str, Any] = Field(default_factory=dict)
+    attributes: dict[str, Any] = field(default_factory=dict)
     filtered: bool = False
     filter_details: Optional[dict[str, Any]] = None
 
@@ -52,10 +86,14 @@ class ExtractionSettings:
             self.allowed_types.add("header")
         if self.organize_content_by_headers:
             self.allowed_types.add("header")
+        self.header_child_types: set[str] = self.allowed_types | {"header"}
+        self.content_key = (frozenset(self.allowed_types), self.remove_formatting, self.remove_anchors, self.remove_filtered)
+        self.rule_key = (*self.content_key, self.use_content_format, self.use_data_format, self.organize_content_by_headers)
 
 
-class BaseContent(BaseModel):
-    model_config = {"arbitrary_types_allowed": True}
+class BaseContent:
+    __slots__ = ()
+    type: ClassVar[str] = ""
 
     def to_content(self, settings: ExtractionSettings) -> str:
         raise NotImplementedError
@@ -69,23 +107,31 @@ class BaseContent(BaseModel):
         return self.to_content(settings)
 
     def is_allowed(self, settings: ExtractionSettings) -> bool:
-        return getattr(self, "type", "") in settings.allowed_types
+        return self.type in settings.allowed_types
+
+    def _append_content_lines(
+        self, settings: ExtractionSettings, out: list[str], content_lines: dict[int, list[str]]
+    ) -> None:
+        block = self.to_content(settings)
+        if block:
+            out.extend(block.splitlines())
 
 
+@dataclass(slots=True)
 class TextContent(BaseContent):
-    type: str = "text"
+    type: ClassVar[str] = "text"
     content: str
-    metadata: ElementMetadata = Field(default_factory=ElementMetadata)
+    metadata: ElementMetadata = field(default_factory=ElementMetadata)
 
     def to_content(self, settings: ExtractionSettings) -> str:
-        if settings.remove_filtered and self.metadata.filtered:
+        if self.metadata.filtered and settings.remove_filtered:
             return ""
         if settings.remove_anchors:
             return self.content
         return self.metadata.attributes.get("fmt-txt") or self.content
 
     def to_data(self, settings: ExtractionSettings) -> dict[str, Any]:
-        if settings.remove_filtered and self.metadata.filtered:
+        if self.metadata.filtered and settings.remove_filtered:
             return {}
         if settings.remove_anchors:
             return {"type": "text", "content": self.content}
@@ -93,40 +139,43 @@ class TextContent(BaseContent):
         return {"type": "text", "content": content}
 
 
+@dataclass(slots=True)
 class CodeBlock(BaseContent):
-    type: str = "code"
+    type: ClassVar[str] = "code"
     content: str
-    metadata: ElementMetadata = Field(default_factory=ElementMetadata)
+    metadata: ElementMetadata = field(default_factory=ElementMetadata)
 
     def to_data(self, settings: ExtractionSettings) -> dict[str, Any]:
-        if settings.remove_filtered and self.metadata.filtered:
+        if self.metadata.filtered and settings.remove_filtered:
             return {}
         return {"type": "code", "content": self.content}
 
     def to_content(self, settings: ExtractionSettings) -> str:
-        if settings.remove_filtered and self.metadata.filtered:
+        if self.metadata.filtered and settings.remove_filtered:
             return ""
         return f"```\n{self.content}\n```"
 
 
+@dataclass(slots=True)
 class Quote(BaseContent):
-    type: str = "quote"
+    type: ClassVar[str] = "quote"
     content: str
-    metadata: ElementMetadata = Field(default_factory=ElementMetadata)
+    metadata: ElementMetadata = field(default_factory=ElementMetadata)
 
     def to_data(self, settings: ExtractionSettings) -> dict[str, Any]:
-        if settings.remove_filtered and self.metadata.filtered:
+        if self.metadata.filtered and settings.remove_filtered:
             return {}
         return {"type": "quote", "content": self.content}
 
     def to_content(self, settings: ExtractionSettings) -> str:
-        if settings.remove_filtered and self.metadata.filtered:
+        if self.metadata.filtered and settings.remove_filtered:
             return ""
         return f"\u201c{self.content}\u201d"
 
 
+@dataclass(slots=True)
 class Image(BaseContent):
-    type: str = "image"
+    type: ClassVar[str] = "image"
     src: str
     alt: str = ""
     width: str = ""
@@ -135,11 +184,11 @@ class Image(BaseContent):
     loading: str = ""
     is_data_url: bool = False
     caption: str = ""
-    all_sources: list[str] = Field(default_factory=list)
-    metadata: ElementMetadata = Field(default_factory=ElementMetadata)
+    all_sources: list[str] = field(default_factory=list)
+    metadata: ElementMetadata = field(default_factory=ElementMetadata)
 
     def to_data(self, settings: ExtractionSettings) -> dict[str, Any]:
-        if settings.remove_filtered and self.metadata.filtered:
+        if self.metadata.filtered and settings.remove_filtered:
             return {}
         return {
             "type": "image",
@@ -149,11 +198,11 @@ class Image(BaseContent):
             "height": self.height,
             "title": self.title,
             "caption": self.caption,
-            "srcset": list(set(self.all_sources)),
+            "srcset": list(dict.fromkeys(self.all_sources)),
         }
 
     def to_content(self, settings: ExtractionSettings) -> str:
-        if settings.remove_filtered and self.metadata.filtered:
+        if self.metadata.filtered and settings.remove_filtered:
             return ""
         alt_text = ""
         if self.caption and self.caption.strip():
@@ -167,31 +216,33 @@ class Image(BaseContent):
         return ""
 
 
+@dataclass(slots=True)
 class Audio(BaseContent):
-    type: str = "audio"
+    type: ClassVar[str] = "audio"
     src: str
     controls: bool = False
     autoplay: bool = False
     loop: bool = False
     muted: bool = False
     preload: str = ""
-    sources: list[dict[str, str]] = Field(default_factory=list)
-    tracks: list[dict[str, str]] = Field(default_factory=list)
-    metadata: ElementMetadata = Field(default_factory=ElementMetadata)
+    sources: list[dict[str, str]] = field(default_factory=list)
+    tracks: list[dict[str, str]] = field(default_factory=list)
+    metadata: ElementMetadata = field(default_factory=ElementMetadata)
 
     def to_data(self, settings: ExtractionSettings) -> dict[str, Any]:
-        if settings.remove_filtered and self.metadata.filtered:
+        if self.metadata.filtered and settings.remove_filtered:
             return {}
         return {"type": "audio", "src": self.src, "sources": self.sources, "tracks": self.tracks}
 
     def to_content(self, settings: ExtractionSettings) -> str:
-        if settings.remove_filtered and self.metadata.filtered:
+        if self.metadata.filtered and settings.remove_filtered:
             return ""
         return f"[Audio]({self.src})" if self.src else ""
 
 
+@dataclass(slots=True)
 class Video(BaseContent):
-    type: str = "video"
+    type: ClassVar[str] = "video"
     src: str
     poster: str = ""
     width: str = ""
@@ -202,13 +253,13 @@ class Video(BaseContent):
     muted: bool = False
     preload: str = ""
     playsinline: bool = False
-    sources: list[dict[str, str]] = Field(default_factory=list)
-    tracks: list[dict[str, str]] = Field(default_factory=list)
+    sources: list[dict[str, str]] = field(default_factory=list)
+    tracks: list[dict[str, str]] = field(default_factory=list)
     provider: str = ""
-    metadata: ElementMetadata = Field(default_factory=ElementMetadata)
+    metadata: ElementMetadata = field(default_factory=ElementMetadata)
 
     def to_data(self, settings: ExtractionSettings) -> dict[str, Any]:
-        if settings.remove_filtered and self.metadata.filtered:
+        if self.metadata.filtered and settings.remove_filtered:
             return {}
         return {
             "type": "video",
@@ -222,7 +273,7 @@ class Video(BaseContent):
         }
 
     def to_content(self, settings: ExtractionSettings) -> str:
-        if settings.remove_filtered and self.metadata.filtered:
+        if self.metadata.filtered and settings.remove_filtered:
             return ""
         if self.provider and self.provider.strip() and self.src:
             provider = self.provider.strip().capitalize()
@@ -232,82 +283,80 @@ class Video(BaseContent):
         return ""
 
 
+@dataclass(slots=True)
 class ListElement(BaseContent):
-    type: str = "list"
-    content: list[Any] = Field(default_factory=list)
-    metadata: ElementMetadata = Field(default_factory=ElementMetadata)
+    type: ClassVar[str] = "list"
+    content: list[Any] = field(default_factory=list)
+    metadata: ElementMetadata = field(default_factory=ElementMetadata)
 
-    def _flatten_python_list(self, items: list[Any], settings: ExtractionSettings) -> list[str]:
-        texts: list[str] = []
+    def _flatten_python_list(self, items: list[Any], settings: ExtractionSettings, texts: list[str]) -> list[str]:
+        append = texts.append
         for item in items:
             if isinstance(item, CodeBlock):
                 code_content = item.to_content(settings)
                 if code_content:
-                    texts.append(code_content)
+                    append(code_content)
                 continue
-            if hasattr(item, "to_content"):
+            if isinstance(item, BaseContent):
                 content = item.to_content(settings)
                 if content:
-                    texts.append(str(content).replace("\n", " ").strip())
+                    append(str(content).replace("\n", " ").strip())
             elif isinstance(item, ListElement):
-                if settings.remove_filtered and item.metadata.filtered:
+                if item.metadata.filtered and settings.remove_filtered:
                     continue
-                texts.extend(self._flatten_python_list(item.content, settings))
+                self._flatten_python_list(item.content, settings, texts)
             elif isinstance(item, dict):
                 t = item.get("type")
                 c = item.get("content")
                 if t == "text" and isinstance(c, str):
-                    texts.append(c.strip())
+                    append(c.strip())
                 elif t == "list" and isinstance(c, list):
-                    texts.extend(self._flatten_python_list(c, settings))
+                    self._flatten_python_list(c, settings, texts)
                 elif isinstance(c, str):
-                    texts.append(c.strip())
+                    append(c.strip())
                 elif isinstance(c, list):
-                    texts.extend(self._flatten_python_list(c, settings))
+                    self._flatten_python_list(c, settings, texts)
             elif isinstance(item, list):
-                texts.extend(self._flatten_python_list(item, settings))
+                self._flatten_python_list(item, settings, texts)
         return texts
 
     def to_data(self, settings: ExtractionSettings) -> dict[str, Any]:
-        if settings.remove_filtered and self.metadata.filtered:
+        if self.metadata.filtered and settings.remove_filtered:
             return {}
-        return {"type": "list", "content": self._flatten_python_list(self.content, settings), "after": "", "before": ""}
+        return {"type": "list", "content": self._flatten_python_list(self.content, settings, []), "after": "", "before": ""}
 
     def to_content(self, settings: ExtractionSettings) -> str:
-        if settings.remove_filtered and self.metadata.filtered:
+        if self.metadata.filtered and settings.remove_filtered:
             return ""
-        lines = []
-        for line in self._flatten_python_list(self.content, settings):
-            if settings.remove_formatting:
-                lines.append(line)
-            else:
-                lines.append(f"- {line}")
-        return "\n".join(lines)
-
-    def _extract_nested_allowed_content(self, content_items: list[Any], settings: ExtractionSettings) -> list[Any]:
-        items: list[Any] = []
+        lines = self._flatten_python_list(self.content, settings, [])
+        if settings.remove_formatting:
+            return "\n".join(lines)
+        return "\n".join([f"- {line}" for line in lines])
+
+    def _extract_nested_allowed_content(
+        self, content_items: list[Any], settings: ExtractionSettings, items: list[Any]
+    ) -> list[Any]:
         for item in content_items:
             if isinstance(item, list):
-                nested = self._extract_nested_allowed_content(item, settings)
-                if nested:
-                    items.extend(nested)
-            elif hasattr(item, "is_allowed") and item.is_allowed(settings) and getattr(item, "type", "") != "text":
+                self._extract_nested_allowed_content(item, settings, items)
+            elif isinstance(item, BaseContent) and item.is_allowed(settings) and item.type != "text":
                 items.append(item)
         return items
 
     def extract_nested_allowed_data(self, settings: ExtractionSettings) -> list[Any]:
-        items = self._extract_nested_allowed_content(self.content, settings)
+        items = self._extract_nested_allowed_content(self.content, settings, [])
         return [item.to_data(settings) for item in items]
 
     def extract_nested_allowed_content(self, settings: ExtractionSettings) -> str:
-        items = self._extract_nested_allowed_content(self.content, settings)
+        items = self._extract_nested_allowed_content(self.content, settings, [])
         return "\n".join(item.to_content(settings) for item in items)
 
 
+@dataclass(slots=True)
 class Table(BaseContent):
-    type: str = "table"
-    content: list[dict[str, list[Any]]] = Field(default_factory=list)
-    metadata: ElementMetadata = Field(default_factory=ElementMetadata)
+    type: ClassVar[str] = "table"
+    content: list[dict[str, list[Any]]] = field(default_factory=list)
+    metadata: ElementMetadata = field(default_factory=ElementMetadata)
 
     def _flatten_cell_to_text(self, cell_content: Any, settings: ExtractionSettings) -> str:
         result: list[str] = []
@@ -315,9 +364,10 @@ class Table(BaseContent):
             return cell_content.to_content(settings)
         if not isinstance(cell_content, list):
             cell_content = [cell_content]
+        remove_filtered = settings.remove_filtered
         for item in cell_content:
-            if hasattr(item, "to_content"):
-                if settings.remove_filtered and hasattr(item, "metadata") and item.metadata.filtered:
+            if isinstance(item, BaseContent):
+                if item.metadata.filtered and remove_filtered:
                     continue
                 content = item.to_content(settings)
                 if content:
@@ -328,46 +378,48 @@ class Table(BaseContent):
         result: list[str] = []
         items = cell_content if isinstance(cell_content, list) else [cell_content]
         for item in items:
-            if hasattr(item, "to_content"):
-                if not settings.remove_filtered and hasattr(item, "metadata") and item.metadata.filtered:
+            if isinstance(item, BaseContent):
+                if item.metadata.filtered and not settings.remove_filtered:
                     continue
                 content = item.to_content(settings)
                 if content:
                     result.append(str(content))
         return "\n".join(result)
 
-    def to_data(self, settings: ExtractionSettings) -> dict[str, Any]:
-        if settings.remove_filtered and self.metadata.filtered:
-            return {}
-        flattened_rows: list[dict[str, str]] = []
-        all_columns: set[str] = set()
+    def _flatten_rows(
+        self, flatten_cell: Callable[[Any, ExtractionSettings], str], settings: ExtractionSettings
+    ) -> list[dict[str, str]]:
+        rows: list[dict[str, str]] = []
+        columns: dict[str, None] = {}
         for row in self.content:
             flattened_row: dict[str, str] = {}
             for column, cell_content in row.items():
-                flattened_row[column] = self._flatten_cell_to_data(cell_content, settings)
-                all_columns.add(column)
+                flattened_row[column] = flatten_cell(cell_content, settings)
+                columns[column] = None
             if not any(val.strip() for val in flattened_row.values()):
                 continue
-            flattened_rows.append(flattened_row)
-        normalized = [{col: row.get(col, "") for col in all_columns} for row in flattened_rows]
+            rows.append(flattened_row)
+        for i, row in enumerate(rows):
+            if len(row) != len(columns):
+                rows[i] = {col: row.get(col, "") for col in columns}
+        return rows
+
+    def to_data(self, settings: ExtractionSettings) -> dict[str, Any]:
+        if self.metadata.filtered and settings.remove_filtered:
+            return {}
+        normalized = self._flatten_rows(self._flatten_cell_to_data, settings)
         return {"type": "table", "rows": normalized, "before": "", "after": ""}
 
     def to_content(self, settings: ExtractionSettings) -> str:
-        if settings.remove_filtered and self.metadata.filtered:
+        if self.metadata.filtered and settings.remove_filtered:
             return ""
         if not self.content:
             return ""
-        flattened_rows: list[dict[str, str]] = []
-        all_columns: set[str] = set()
-        for row in self.content:
-            flattened_row: dict[str, str] = {}
-            for column, cell_content in row.items():
-                flattened_row[column] = self._flatten_cell_to_text(cell_content, settings)
-                all_columns.add(column)
-            if not any(val.strip() for val in flattened_row.values()):
-                continue
-            flattened_rows.append(flattened_row)
-        normalized = [{col: row.get(col, "") for col in all_columns} for row in flattened_rows]
+        normalized = self._flatten_rows(self._flatten_cell_to_text, settings)
+        if normalized:
+            formatted = _format_text_table(normalized, with_rule=not settings.remove_formatting)
+            if formatted is not None:
+                return formatted
         fmt = "plain" if settings.remove_formatting else "simple"
         return tabulate(normalized, tablefmt=fmt, headers="keys")
 
@@ -376,7 +428,7 @@ class Table(BaseContent):
         for row in self.content:
             for values in row.values():
                 for value in values:
-                    if hasattr(value, "is_allowed") and value.is_allowed(settings) and getattr(value, "type", "") != "text":
+                    if isinstance(value, BaseContent) and value.is_allowed(settings) and value.type != "text":
                         items.append(value)
         return items
 
@@ -389,110 +441,94 @@ class Table(BaseContent):
         return "\n".join(item.to_content(settings) for item in items)
 
 
+@dataclass(slots=True)
 class Header(BaseContent):
-    type: str = "header"
+    type: ClassVar[str] = "header"
     level: int
     text: str
-    content: list[Any] = Field(default_factory=list)
-    metadata: ElementMetadata = Field(default_factory=ElementMetadata)
+    content: list[Any] = field(default_factory=list)
+    metadata: ElementMetadata = field(default_factory=ElementMetadata)
 
     def _flatten_to_data_lines(self, items: list[Any], settings: ExtractionSettings) -> list[Any]:
         lines: list[Any] = []
+        child_types = settings.header_child_types
+        remove_filtered = settings.remove_filtered
         for item in items:
-            if not hasattr(item, "is_allowed"):
+            if not isinstance(item, BaseContent):
                 continue
-            if not item.is_allowed(settings) and getattr(item, "type", "") != "header":
+            if item.type not in child_types:
                 continue
-            if isinstance(item, CodeBlock):
-                code = item.to_data(settings)
-                if code:
-                    lines.append(code)
-            elif isinstance(item, ListElement) and "list" not in settings.allowed_types:
-                allowed_items = item.extract_nested_allowed_data(settings)
-                if allowed_items:
-                    lines.extend(allowed_items)
-            elif isinstance(item, Table) and "table" not in settings.allowed_types:
-                allowed_items = item.extract_nested_allowed_data(settings)
-                if allowed_items:
-                    lines.extend(allowed_items)
-            elif hasattr(item, "to_data"):
-                if settings.remove_filtered and hasattr(item, "metadata") and item.metadata.filtered:
-                    continue
-                content_block = item.to_data(settings)
-                if content_block:
-                    if isinstance(content_block, list):
-                        lines.extend(content_block)
-                    else:
-                        lines.append(content_block)
-            elif isinstance(item, list):
-                for sub in item:
-                    if hasattr(sub, "to_data"):
-                        if settings.remove_filtered and hasattr(sub, "metadata") and sub.metadata.filtered:
-                            continue
-                        data = sub.to_data(settings)
-                        if isinstance(data, list):
-                            lines.extend(data)
-                        else:
-                            lines.append(data)
+            if item.metadata.filtered and remove_filtered:
+                continue
+            content_block = item.to_data(settings)
+            if content_block:
+                if isinstance(content_block, list):
+                    lines.extend(content_block)
+                else:
+                    lines.append(content_block)
         return lines
 
-    def _flatten_to_content_lines(self, items: list[Any], settings: ExtractionSettings) -> list[str]:
-        lines: list[str] = []
+    def _flatten_to_content_lines(
+        self, items: list[Any], settings: ExtractionSettings, lines: list[str], content_lines: dict[int, list[str]]
+    ) -> list[str]:
+        child_types = settings.header_child_types
+        remove_filtered = settings.remove_filtered
         for item in items:
-            if not hasattr(item, "is_allowed"):
+            if not isinstance(item, BaseContent):
                 continue
-            if not item.is_allowed(settings) and getattr(item, "type", "") != "header":
+            if item.type not in child_types:
                 continue
-            if isinstance(item, CodeBlock):
-                code = item.to_content(settings)
-                if code:
-                    lines.extend(code.splitlines())
-            elif isinstance(item, Table) and "table" not in settings.allowed_types:
-                allowed_content = item.extract_nested_allowed_content(settings)
-                if allowed_content.strip():
-                    lines.extend(allowed_content.splitlines())
-            elif isinstance(item, ListElement) and "list" not in settings.allowed_types:
-                allowed_content = item.extract_nested_allowed_content(settings)
-                if allowed_content.strip():
-                    lines.extend(allowed_content.splitlines())
-            elif hasattr(item, "to_content"):
-                if settings.remove_filtered and hasattr(item, "metadata") and item.metadata.filtered:
-                    continue
-                content_block = item.to_content(settings)
-                if content_block:
-                    lines.extend(content_block.splitlines())
-            elif isinstance(item, list):
-                for sub in item:
-                    if hasattr(sub, "to_content"):
-                        if settings.remove_filtered and hasattr(sub, "metadata") and sub.metadata.filtered:
-                            continue
-                        data = sub.to_content(settings)
-                        if data:
-                            lines.extend(data.splitlines())
+            if item.metadata.filtered and remove_filtered:
+                continue
+            item._append_content_lines(settings, lines, content_lines)
         return lines
 
-    def to_content(self, settings: ExtractionSettings) -> str:
+    def _content_lines(self, settings: ExtractionSettings, content_lines: dict[int, list[str]]) -> list[str]:
+        # content_lines is a per-extraction memo, so nested headers are rendered once and reused by every ancestor.
+        lines = content_lines.get(id(self))
+        if lines is None:
+            lines = content_lines[id(self)] = self._flatten_to_content_lines(self.content, settings, [], content_lines)
+        return lines
+
+    def _header_line(self, settings: ExtractionSettings) -> Optional[str]:
+        if not self.is_allowed(settings) or (self.metadata.filtered and settings.remove_filtered):
+            return None
         if self.level == 0:
-            header_line = ""
-        elif settings.remove_formatting:
-            header_line = self.text
-        else:
-            header_line = f"{'#' * self.level} {self.text}"
+            return ""
+        if settings.remove_formatting:
+            return self.text
+        if self.level < len(_HEADER_PREFIXES):
+            return _HEADER_PREFIXES[self.level] + self.text
+        return f"{'#' * self.level} {self.text}"
+
+    def to_content(self, settings: ExtractionSettings) -> str:
+        return self._render_content(settings, {})
 
+    def _render_content(self, settings: ExtractionSettings, content_lines: dict[int, list[str]]) -> str:
         lines: list[str] = []
-        if self.is_allowed(settings):
-            if not (settings.remove_filtered and self.metadata.filtered):
-                lines.append(header_line)
-        header_lines = self._flatten_to_content_lines(self.content, settings)
-        if header_lines:
-            lines.extend(header_lines)
+        header_line = self._header_line(settings)
+        if header_line is not None:
+            lines.append(header_line)
+        lines.extend(self._content_lines(settings, content_lines))
         return "\n".join(lines)
 
+    def _append_content_lines(
+        self, settings: ExtractionSettings, out: list[str], content_lines: dict[int, list[str]]
+    ) -> None:
+        # Same lines as to_content(...).splitlines(), without the join/split round trip.
+        start = len(out)
+        header_line = self._header_line(settings)
+        if header_line is not None:
+            out.extend(header_line.splitlines() if header_line else ("",))
+        out.extend(self._content_lines(settings, content_lines))
+        if len(out) > start and out[-1] == "":
+            out.pop()
+
     def to_data(self, settings: ExtractionSettings) -> list[Any]:
         data_lines: list[Any] = []
         data = {"type": "header", "level": self.level, "content": self.text}
         if self.is_allowed(settings):
-            if not (settings.remove_filtered and self.metadata.filtered):
+            if not (self.metadata.filtered and settings.remove_filtered):
                 data_lines.append(data)
         flat_lines = self._flatten_to_data_lines(self.content, settings)
         if flat_lines:
@@ -500,36 +536,37 @@ class Header(BaseContent):
         return data_lines
 
 
+@dataclass(slots=True)
 class OrganizedData(BaseContent):
-    content: list[Any] = Field(default_factory=list)
+    content: list[Any] = field(default_factory=list)
 
-    def _content_organized_by_headers(self, settings: ExtractionSettings) -> dict[str, str]:
+    def _content_organized_by_headers(
+        self, settings: ExtractionSettings, content_lines: dict[int, list[str]]
+    ) -> dict[str, str]:
         result: dict[str, str] = {}
         header_counts: dict[str, int] = defaultdict(int)
 
         def _process(items: list[Any]) -> None:
             for item in items:
-                if hasattr(item, "type") and item.type == "header":
+                if isinstance(item, Header):
                     header_text = item.text
                     header_counts[header_text] += 1
                     header_key = f"{header_text} ({header_counts[header_text]})" if header_counts[header_text] > 1 else header_text
-                    result[header_key] = item.to_content(settings)
+                    result[header_key] = item._render_content(settings, content_lines)
                     if item.content:
                         _process(item.content)
 
         _process(self.content)
         return result
 
-    def _extract_content(self, settings: ExtractionSettings) -> Any:
+    def _extract_content(self, settings: ExtractionSettings, content_lines: dict[int, list[str]]) -> Any:
         if settings.organize_content_by_headers:
-            return self._content_organized_by_headers(settings)
-        regular = [item for item in self.content if not (hasattr(item, "level") and item.level == 0)]
-        level_zero = [item for item in self.content if hasattr(item, "level") and item.level == 0]
+            return self._content_organized_by_headers(settings, content_lines)
+        regular = [item for item in self.content if not (isinstance(item, Header) and item.level == 0)]
+        level_zero = [item for item in self.content if isinstance(item, Header) and item.level == 0]
         lines: list[str] = []
         for item in regular + level_zero:
-            item_lines = item.to_content(settings)
-            if item_lines:
-                lines.extend(item_lines.splitlines())
+            item._append_content_lines(settings, lines, content_lines)
         return "\n".join(lines)
 
     def _extract_data(self, settings: ExtractionSettings) -> list[Any]:
@@ -541,13 +578,27 @@ class OrganizedData(BaseContent):
         return lines
 
     def _extract_by_rule(self, rule: dict[str, Any]) -> Any:
-        settings = ExtractionSettings(rule["allowed_children"], rule["options"])
+        return self._extract_with_settings(ExtractionSettings(rule["allowed_children"], rule["options"]))
+
+    def _extract_with_settings(
+        self, settings: ExtractionSettings, content_lines: Optional[dict[int, list[str]]] = None
+    ) -> Any:
         if settings.use_data_format:
             return self._extract_data(settings)
-        return self._extract_content(settings)
+        return self._extract_content(settings, {} if content_lines is None else content_lines)
 
     def extract(self, rules: list[dict[str, Any]]) -> dict[str, Any]:
         output: dict[str, Any] = {}
+        by_rule_key: dict[tuple[Any, ...], Any] = {}
+        content_lines: dict[tuple[Any, ...], dict[int, list[str]]] = {}
         for rule in rules:
-            output[rule["name"]] = self._extract_by_rule(rule)
+            settings = ExtractionSettings(rule["allowed_children"], rule["options"])
+            if settings.rule_key in by_rule_key:
+                # Rules with the same settings share the render; mutable results are copied so each rule owns its output.
+                result = by_rule_key[settings.rule_key]
+                output[rule["name"]] = result if isinstance(result, str) else copy.deepcopy(result)
+            else:
+                output[rule["name"]] = by_rule_key[settings.rule_key] = self._extract_with_settings(
+                    settings, content_lines.setdefault(settings.content_key, {})
+                )
         return output
@@ -3,12 +3,16 @@ from __future__ import annotations
 import logging
 import os
 import tempfile
-from urllib.parse import urlparse
+import time
+from urllib.parse import urlsplit
 
 import httpx
 
 logger = logging.getLogger(__name__)
 
+FILTER_LIST_MAX_AGE_SECONDS = 24 * 60 * 60
+DOMAIN_VERDICT_CACHE_SIZE = 4096
+
 LIST_REGISTRY: dict[str, dict[str, str]] = {
     "easylist": {
         "url": "https://easylist.to/easylist/easylist.txt",
@@ -21,6 +25,32 @@ LIST_REGISTRY: dict[str, dict[str, str]] = {
 }
 
 
+def _file_age_seconds(path: str) -> float | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    if not stat.st_size:
+        return None
+    return time.time() - stat.st_mtime
+
+
+def _write_text_atomic(path: str, content: str) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _read_text(path: str) -> str:
+    with open(path) as f:
+        return f.read()
+
+
 class AdblockConfigLoader:
     _instance: AdblockConfigLoader | None = None
 
@@ -46,24 +76,27 @@ class AdblockConfigLoader:
 
         entry = LIST_REGISTRY[list_key]
         local_path = os.path.join(self._cache_dir, entry["local"])
+        local_age = _file_age_seconds(local_path)
         content = ""
 
-        try:
-            resp = httpx.get(entry["url"], timeout=10)
-            if resp.status_code == 200:
-                content = resp.text
-                with open(local_path, "w") as f:
-                    f.write(content)
-                logger.debug("Fetched and saved '%s' from URL", entry["local"])
-            else:
-                raise Exception(f"Status {resp.status_code}")
-        except Exception:
-            if os.path.exists(local_path):
-                with open(local_path) as f:
-                    content = f.read()
-                logger.debug("Loaded local copy of '%s'", entry["local"])
-            else:
-                logger.warning("No filter list available for '%s'", list_key)
+        if local_age is not None and local_age < FILTER_LIST_MAX_AGE_SECONDS:
+            content = _read_text(local_path)
+            logger.debug("Loaded local copy of '%s'", entry["local"])
+        else:
+            try:
+                resp = httpx.get(entry["url"], timeout=10)
+                if resp.status_code == 200:
+                    content = resp.text
+                    _write_text_atomic(local_path, content)
+                    logger.debug("Fetched and saved '%s' from URL", entry["local"])
+                else:
+                    raise Exception(f"Status {resp.status_code}")
+            except Exception:
+                if local_age is not None:
+                    content = _read_text(local_path)
+                    logger.debug("Loaded stale local copy of '%s'", entry["local"])
+                else:
+                    logger.warning("No filter list available for '%s'", list_key)
 
         self._configs[list_key] = content
         return content
@@ -88,6 +121,7 @@ class DomainFilter:
             list_keys = [list_keys]
         self.list_keys = list_keys
         self.blocked_domains: set[str] = set()
+        self._domain_verdicts: dict[str, bool] = {}
         self.loaded_count = 0
         self.skipped_count = 0
         self._initialized = True
@@ -126,18 +160,25 @@ class DomainFilter:
 
     def should_block(self, url: str) -> bool:
         try:
-            domain = urlparse(url).netloc
-            if ":" in domain:
-                domain = domain.split(":")[0]
+            domain = urlsplit(url).netloc.partition(":")[0]
             if not domain:
                 return False
-            if domain in self.blocked_domains:
-                return True
-            parts = domain.split(".")
-            for i in range(1, len(parts)):
-                parent = ".".join(parts[i:])
-                if parent in self.blocked_domains:
-                    return True
-            return False
+            verdict = self._domain_verdicts.get(domain)
+            if verdict is None:
+                if len(self._domain_verdicts) >= DOMAIN_VERDICT_CACHE_SIZE:
+                    self._domain_verdicts.clear()
+                verdict = self._domain_verdicts[domain] = self._is_blocked_domain(domain)
+            return verdict
         except Exception:
             return False
+
+    def _is_blocked_domain(self, domain: str) -> bool:
+        blocked = self.blocked_domains
+        if domain in blocked:
+            return True
+        dot = domain.find(".")
+        while dot != -1:
+            if domain[dot + 1:] in blocked:
+                return True
+            dot = domain.find(".", dot + 1)
+        return False
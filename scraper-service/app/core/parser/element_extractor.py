@@ -2,11 +2,11 @@ from __future__ import annotations
 
 import logging
 import re
-from collections import Counter, defaultdict
-from typing import Any, Optional, Union
+from collections import Counter
+from typing import Any, Callable, Optional, Union
 
 from bs4 import BeautifulSoup, Comment, NavigableString, Tag
-from markdownify import markdownify as md
+from markdownify import MarkdownConverter, markdownify
 
 from app.core.parser.data_types import (
     Audio,
@@ -29,19 +29,77 @@ from app.utils.url import is_data_url, join_url
 
 logger = logging.getLogger(__name__)
 
+_EMPTY_METADATA = ElementMetadata()
+_MARKDOWN = MarkdownConverter()
+# markdownify renders these from their ancestors, which lie outside a code block in the page tree.
+_ANCESTOR_DEPENDENT_TAGS = ("li", "tr")
+_CONTENT_FILTER_TAGS = ["ContentFilter", "contentfilter"]
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_HEADER_LEVELS = {f"h{level}": level for level in range(1, 7)}
+_IMG_SOURCE_ATTRS = (
+    "src", "data-src", "data-lazy", "data-original", "data-lazy-src", "data-original-src",
+    "data-url", "data-hi-res-src", "data-full-src", "lazy-src", "nitro-lazy-src", "srcset",
+)
+_TABLE_INDICATOR_TAGS = frozenset(("table", "th", "thead", "caption"))
+_TRACKING_PIXEL_BASE64 = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8"
+
+
+def _normalize_list_items(obj: Any) -> Any:
+    if not isinstance(obj, list):
+        return obj
+    while len(obj) == 1 and isinstance(obj[0], list):
+        obj = obj[0]
+    return [_normalize_list_items(item) for item in obj]
+
+
+def _flatten_content_items(obj: Any) -> list[Any]:
+    result: list[Any] = []
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, BaseContent):
+            result.append(value)
+        elif isinstance(value, list):
+            stack.extend(reversed(value))
+    return result
+
 
 class ElementExtractor:
     def __init__(self) -> None:
         self.url: Optional[str] = None
         self.hashes: list[str] = []
-        self.metadata: dict[str, int] = defaultdict(int)
+        self.list_count = 0
+        self.table_count = 0
+        self.code_block_count = 0
         self.skip_empty_clicks = True
         self.domain_filter = DomainFilter(list_keys="easylist")
         self.organized_data: Optional[OrganizedData] = None
         self.header_stack: Optional[list[Union[OrganizedData, Header]]] = None
+        self._checked_urls: dict[str, Optional[str]] = {}
+        self._has_content_filter = True
+        self._handlers: dict[str, Callable[[Tag, bool], Any]] = {
+            "figure": self._parse_figure,
+            "img": self._parse_img,
+            "picture": self._parse_picture,
+            "audio": self._parse_audio,
+            "video": self._parse_video,
+            "dynamic-content": self._handle_dynamic_content,
+            "pre": self._handle_code,
+            "code": self._handle_code,
+            "blockquote": self._handle_blockquote,
+            "ul": self._extract_lists,
+            "ol": self._extract_lists,
+            "table": self._handle_tables,
+            "p": self._handle_p,
+            "span": self._handle_p,
+            "a": self._handle_p,
+            "th": self._handle_p,
+        }
+        for header_tag in _HEADER_LEVELS:
+            self._handlers[header_tag] = self._handle_header
 
     def _create_metadata(self, element: Union[Tag, NavigableString]) -> ElementMetadata:
-        filtered_parent = element.find_parent(["ContentFilter", "contentfilter"])
+        filtered_parent = element.find_parent(_CONTENT_FILTER_TAGS) if self._has_content_filter else None
         if filtered_parent:
             if isinstance(element, Tag):
                 attr_name = filtered_parent.get("type")
@@ -53,20 +111,51 @@ class ElementExtractor:
         else:
             removal_details = None
 
-        kwargs: dict[str, Any] = {"filtered": bool(filtered_parent), "filter_details": removal_details}
-
-        if isinstance(element, NavigableString):
-            return ElementMetadata(tag=None, attributes={}, **kwargs)
         if isinstance(element, Tag):
-            return ElementMetadata(tag=element.name, attributes=dict(element.attrs), **kwargs)
-        return ElementMetadata(**kwargs)
+            return ElementMetadata(
+                tag=element.name,
+                attributes=dict(element.attrs),
+                filtered=bool(filtered_parent),
+                filter_details=removal_details,
+            )
+        if removal_details is None:
+            return _EMPTY_METADATA
+        return ElementMetadata(filtered=True, filter_details=removal_details)
+
+    def _contains_content_filter(self, element: Tag) -> bool:
+        if element.name in _CONTENT_FILTER_TAGS:
+            return True
+        return element.find(_CONTENT_FILTER_TAGS) is not None or element.find_parent(_CONTENT_FILTER_TAGS) is not None
+
+    @staticmethod
+    def _leaf_text(element: Tag, strip: bool) -> Optional[str]:
+        string_types = element.interesting_string_types or Tag.MAIN_CONTENT_STRING_TYPES
+        if isinstance(string_types, type):
+            string_types = (string_types,)
+        parts: list[str] = []
+        for child in element.children:
+            if child.name is not None:
+                return None
+            if type(child) in string_types:
+                if strip:
+                    child = child.strip()
+                    if not child:
+                        continue
+                parts.append(child)
+        return "".join(parts)
 
     def _has_element_children(self, element: Tag) -> bool:
         return any(child for child in element.children if child.name is not None)
 
-    def _get_clean_html(self, main_content: object) -> BeautifulSoup:
-        flattened_html = HTMLFlattener(main_content, url=self.url).process_html()
-        return BeautifulSoup(re.sub(r"<!--.*?-->", "", flattened_html, flags=re.DOTALL), "lxml")
+    def _get_clean_html(self, main_content: object) -> Tag:
+        flattener = HTMLFlattener(main_content, url=self.url)
+        flattened = flattener.flatten()
+        if flattener.requires_reparse:
+            return BeautifulSoup(_COMMENT_RE.sub("", str(flattened)), "lxml")
+        for comment in flattened.find_all(string=lambda text: isinstance(text, Comment)):
+            comment.extract()
+        flattened.smooth()
+        return flattened
 
     def _add_content(self, content_item: Optional[Any]) -> None:
         if content_item and self.header_stack:
@@ -75,14 +164,6 @@ class ElementExtractor:
             else:
                 self.header_stack[-1].content.append(content_item)
 
-    def _increment_metadata_count(self, content_type: str) -> None:
-        if content_type in ("Lists", "Ordered Lists", "ul", "ol"):
-            self.metadata["list_count"] += 1
-        elif content_type == "Table":
-            self.metadata["table_count"] += 1
-        elif content_type == "code":
-            self.metadata["code_block_count"] += 1
-
     def extract_content(
         self,
         main_content: Any,
@@ -90,22 +171,28 @@ class ElementExtractor:
         url: Optional[str] = None,
     ) -> dict[str, Any]:
         self.url = url
-        self.metadata = defaultdict(int)
+        self._checked_urls = {}
+        self.list_count = self.table_count = self.code_block_count = 0
         self.hashes = []
         self.organized_data = OrganizedData()
 
-        unassociated_header = Header(level=0, text="unassociated", content=[], metadata=ElementMetadata())
+        unassociated_header = Header(level=0, text="unassociated", content=[], metadata=_EMPTY_METADATA)
         self.organized_data.content.append(unassociated_header)
         self.header_stack = [self.organized_data, unassociated_header]
 
         if main_content:
             if clean:
                 main_content = self._get_clean_html(main_content)
+            self._has_content_filter = self._contains_content_filter(main_content)
             self._extract_from_element(main_content, add=True)
 
         return {
             "organized_data": self.organized_data,
-            "metadata": dict(self.metadata),
+            "metadata": {
+                "list_count": self.list_count,
+                "table_count": self.table_count,
+                "code_block_count": self.code_block_count,
+            },
             "hashes": self.hashes,
         }
 
@@ -130,27 +217,9 @@ class ElementExtractor:
         if isinstance(child, NavigableString):
             return self._handle_navigable_string(child, add)
 
-        handler_map = {
-            "figure": self._parse_figure,
-            "img": self._parse_img,
-            "picture": self._parse_picture,
-            "audio": self._parse_audio,
-            "video": self._parse_video,
-            "dynamic-content": self._handle_dynamic_content,
-            "pre": self._handle_code,
-            "code": self._handle_code,
-            "blockquote": self._handle_blockquote,
-            "ul": self._extract_lists,
-            "ol": self._extract_lists,
-            "table": self._handle_tables,
-            "p": self._handle_p,
-            "span": self._handle_p,
-            "a": self._handle_a,
-            "th": self._handle_th,
-        }
-
-        if child.name in handler_map:
-            return handler_map[child.name](child, add)
+        handler = self._handlers.get(child.name)
+        if handler is not None:
+            return handler(child, add)
         elif child.name and child.name.startswith("h") and child.name[1:].isdigit():
             return self._handle_header(child)
         else:
@@ -174,10 +243,11 @@ class ElementExtractor:
         return collected if not add else None
 
     def _handle_blockquote(self, element: Tag, add: bool = True) -> Any:
-        if self._has_element_children(element):
+        text = self._leaf_text(element, strip=False)
+        if text is None:
             return self._extract_from_element(element, add)
         metadata = self._create_metadata(element)
-        text = element.get_text().strip()
+        text = text.strip()
         quote_obj = Quote(content=text, metadata=metadata)
         if add:
             self._add_content(quote_obj)
@@ -186,7 +256,7 @@ class ElementExtractor:
     def _handle_navigable_string(self, child: NavigableString, add: bool = True) -> Optional[TextContent]:
         if child.parent.name == "[document]":
             return None
-        text = " ".join(child.strip().split())
+        text = " ".join(child.split())
         if not text:
             return None
         metadata = self._create_metadata(child)
@@ -197,8 +267,8 @@ class ElementExtractor:
         return text_obj
 
     def _handle_code(self, element: Tag, add: bool = True) -> Optional[CodeBlock]:
-        self._increment_metadata_count("code")
-        rendered_code = md(str(element)).strip().lstrip("`").rstrip("`")
+        self.code_block_count += 1
+        rendered_code = self._render_code(element).strip().lstrip("`").rstrip("`")
         if not rendered_code:
             return None
         metadata = self._create_metadata(element)
@@ -208,36 +278,16 @@ class ElementExtractor:
             return None
         return code_obj
 
-    def _handle_th(self, element: Tag, add: bool = True) -> Any:
-        if self._has_element_children(element):
-            return self._extract_from_element(element, add)
-        text = element.get_text(strip=True)
-        if not text:
-            return None
-        metadata = self._create_metadata(element)
-        text_obj = TextContent(content=text, metadata=metadata)
-        if add:
-            self._add_content(text_obj)
-            return None
-        return text_obj
+    @staticmethod
+    def _render_code(element: Tag) -> str:
+        if element.find(_ANCESTOR_DEPENDENT_TAGS):
+            return markdownify(str(element))
+        return _MARKDOWN.convert_soup(element)
 
     def _handle_p(self, element: Tag, add: bool = True) -> Any:
-        if self._has_element_children(element):
-            return self._extract_from_element(element, add)
-        text = element.get_text(strip=True)
-        if not text:
-            return None
-        metadata = self._create_metadata(element)
-        text_obj = TextContent(content=text, metadata=metadata)
-        if add:
-            self._add_content(text_obj)
-            return None
-        return text_obj
-
-    def _handle_a(self, element: Tag, add: bool = True) -> Any:
-        if self._has_element_children(element):
+        text = self._leaf_text(element, strip=True)
+        if text is None:
             return self._extract_from_element(element, add)
-        text = element.get_text(strip=True)
         if not text:
             return None
         metadata = self._create_metadata(element)
@@ -247,11 +297,11 @@ class ElementExtractor:
             return None
         return text_obj
 
-    def _handle_header(self, element: Tag) -> None:
+    def _handle_header(self, element: Tag, add: bool = True) -> None:
         text = self._normalize_text(element.get_text().strip())
         if not text:
             return None
-        level = int(element.name[1:])
+        level = _HEADER_LEVELS.get(element.name) or int(element.name[1:])
         metadata = self._create_metadata(element)
         new_header = Header(level=level, text=text, content=[], metadata=metadata)
 
@@ -270,8 +320,7 @@ class ElementExtractor:
         self.header_stack.append(new_header)
         return None
 
-    def _table_has_consistent_columns(self, table_element: Tag) -> bool:
-        rows = table_element.find_all("tr")
+    def _table_has_consistent_columns(self, rows: list[Tag]) -> bool:
         if len(rows) < 2:
             return False
         column_counts = [len(row.find_all(recursive=False)) for row in rows]
@@ -279,42 +328,43 @@ class ElementExtractor:
         most_common_freq = counts.most_common(1)[0][1]
         return most_common_freq >= 0.9 * len(column_counts)
 
-    def _is_table_one_column_layout(self, table_element: Tag) -> bool:
-        all_rows = table_element.find_all("tr")
-        current_rows = [tr for tr in all_rows if tr.find_parent("table") == table_element]
-        col_counts = {len(list(tr.children)) for tr in current_rows}
+    def _is_table_one_column_layout(self, rows: list[Tag]) -> bool:
+        col_counts = {len(tr.contents) for tr in rows}
         return len(col_counts) == 1 and 1 in col_counts
 
-    def _is_data_table(self, table_element: Tag) -> tuple[bool, str]:
-        if table_element.find("table"):
-            return False, "Nested tables — layout table."
+    def _is_data_table(self, table_element: Tag, rows: list[Tag]) -> tuple[bool, str]:
+        indicators: set[str] = set()
+        for descendant in table_element.descendants:
+            name = descendant.name
+            if name in _TABLE_INDICATOR_TAGS:
+                if name == "table":
+                    return False, "Nested tables — layout table."
+                indicators.add(name)
+        # Without nested tables every row and cell below belongs to this table.
         role = table_element.get("role")
         if role == "presentation":
             return False, "Presentation role."
         if role == "table":
             return True, "Table role."
-
-        def belongs(el: Tag) -> bool:
-            return el.find_parent("table") == table_element
-
-        if self._is_table_one_column_layout(table_element):
+        if self._is_table_one_column_layout(rows):
             return False, "Single-column layout."
-        if table_element.find_all(lambda tag: tag.name == "th" and belongs(tag)):
+        if "th" in indicators:
             return True, "Has <th> elements."
-        if table_element.find(lambda tag: tag.name == "thead" and belongs(tag)):
+        if "thead" in indicators:
             return True, "Has <thead>."
-        if table_element.find(lambda tag: tag.name == "caption" and belongs(tag)):
+        if "caption" in indicators:
             return True, "Has <caption>."
         if table_element.get("border") == "1":
             return True, "Has border=1."
-        if self._table_has_consistent_columns(table_element):
+        if self._table_has_consistent_columns(rows):
             return True, "Consistent columns."
         return False, "No data table indicators."
 
     def _handle_tables(self, table_element: Tag, add: bool = True) -> Any:
-        is_valid, _ = self._is_data_table(table_element)
+        rows = table_element.find_all("tr")
+        is_valid, _ = self._is_data_table(table_element, rows)
         if is_valid:
-            return self._extract_tables(table_element, add=add)
+            return self._extract_tables(table_element, rows, add=add)
         table_element.name = "div"
         return self._extract_from_element(table_element, add=add)
 
@@ -326,52 +376,38 @@ class ElementExtractor:
             return contents
         return None
 
-    def _extract_tables(self, element: Tag, add: bool = True) -> Optional[Table]:
-        def flatten_to_items(obj: Any) -> list[Any]:
-            result: list[Any] = []
-
-            def recurse(value: Any) -> None:
-                if isinstance(value, BaseContent):
-                    result.append(value)
-                elif isinstance(value, list):
-                    for item in value:
-                        recurse(item)
-
-            recurse(obj)
-            return result
-
-        self._increment_metadata_count("Table")
+    def _extract_tables(self, element: Tag, rows: list[Tag], add: bool = True) -> Optional[Table]:
+        self.table_count += 1
 
         headers: list[str] = []
         thead = element.find("thead")
-        first_row = element.find("tr")
+        first_row = rows[0] if rows else None
+        row_cells = [row.find_all(recursive=False) for row in rows]
 
         if thead:
             headers = [th.get_text(strip=True) for th in thead.find_all("th")]
             skip_first_row = True
-        elif first_row and all(th.name == "th" for th in first_row.find_all(recursive=False)):
+        elif first_row and all(th.name == "th" for th in row_cells[0]):
             headers = [th.get_text(strip=True) for th in first_row.find_all("th")]
             skip_first_row = True
         else:
-            first_data_row = first_row.find_all(recursive=False) if first_row else []
+            first_data_row = row_cells[0] if first_row else []
             headers = [f"col{i + 1}" for i in range(len(first_data_row))]
             skip_first_row = False
 
-        max_columns = max((len(row.find_all(recursive=False)) for row in element.find_all("tr")), default=0)
+        max_columns = max(map(len, row_cells), default=0)
         if len(headers) < max_columns:
             headers.extend(f"col{i + 1}" for i in range(len(headers), max_columns))
 
         data: list[dict[str, list[Any]]] = []
-        rows = element.find_all("tr")
-        for row in rows[(1 if skip_first_row else 0):]:
+        for cells in row_cells[(1 if skip_first_row else 0):]:
             row_data: dict[str, list[Any]] = {}
-            cells = row.find_all(recursive=False)
             for i, cell in enumerate(cells):
                 if i >= len(headers):
                     break
                 if cell.name not in ("td", "th"):
                     cell_content = self._extract_table_cell_content(cell, add=False)
-                    cell_content = flatten_to_items(cell_content)
+                    cell_content = _flatten_content_items(cell_content)
                     row_data[headers[i]] = cell_content if len(cell_content) > 1 else (cell_content if cell_content else [])
                 else:
                     cell_text = TextContent(
@@ -411,14 +447,6 @@ class ElementExtractor:
                     _add_items(item_content, items)
             return items
 
-        def normalize_lists(obj: Any) -> Any:
-            if isinstance(obj, list):
-                flattened = [normalize_lists(el) for el in obj]
-                while len(flattened) == 1 and isinstance(flattened[0], list):
-                    flattened = [normalize_lists(el) for el in flattened[0]]
-                return flattened
-            return obj
-
         def _add_items(content: Any, items: list[Any]) -> None:
             if isinstance(content, list) and len(content) == 1:
                 items.extend(content)
@@ -432,14 +460,14 @@ class ElementExtractor:
         list_items = parse_list(element)
         metadata = self._create_metadata(element)
         list_obj = ListElement(content=list_items, metadata=metadata)
-        list_obj.content = normalize_lists(list_obj.content)
+        list_obj.content = _normalize_list_items(list_obj.content)
         if add:
             self._add_content(list_obj)
         return list_obj
 
     def _normalize_text(self, text: str) -> str:
-        if text and text.strip():
-            return "  ".join(text.split("\n")).strip()
+        if text:
+            return text.replace("\n", "  ").strip()
         return ""
 
     def _is_tracking_pixel(self, src: str) -> bool:
@@ -447,48 +475,30 @@ class ElementExtractor:
             return False
         is_data, is_base_64 = is_data_url(src)
         if is_data and is_base_64:
-            tracking_pattern = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8"
-            return tracking_pattern in src
+            return _TRACKING_PIXEL_BASE64 in src
         return False
 
     def _parse_img(self, element: Tag, add: bool = True) -> Optional[Image]:
-        source_attrs = ["src", "data-src", "data-lazy", "data-original", "data-lazy-src",
-                        "data-original-src", "data-url", "data-hi-res-src", "data-full-src",
-                        "lazy-src", "nitro-lazy-src", "srcset"]
         final_src = ""
-        found_attr = None
-        for attr in source_attrs:
+        is_data = False
+        for attr in _IMG_SOURCE_ATTRS:
             value = element.get(attr, "")
             if attr == "srcset" and value:
-                parts = value.split(",")
-                if parts:
-                    first_src = parts[0].strip().split(" ")[0]
-                    if first_src:
-                        value = first_src
-            if value:
-                joined = self._join_and_check_url(value)
-                if joined:
-                    found_attr = attr
-                    final_src = joined
-                    break
-        if not final_src:
-            return None
-        is_data, _ = is_data_url(final_src)
-        if is_data and found_attr == "src":
-            for attr in source_attrs[1:]:
-                value = element.get(attr, "")
-                if attr == "srcset" and value:
-                    parts = value.split(",")
-                    if parts:
-                        first_src = parts[0].strip().split(" ")[0]
-                        if first_src:
-                            value = first_src
-                if value:
-                    joined = self._join_and_check_url(value)
-                    if joined:
-                        final_src = joined
-                        is_data = False
-                        break
+                value = value.split(",", 1)[0].strip().split(" ")[0] or value
+            if not value:
+                continue
+            joined = self._join_and_check_url(value)
+            if not joined:
+                continue
+            if final_src:
+                # The first usable source after a data-URL src replaces it.
+                final_src = joined
+                is_data = False
+                break
+            final_src = joined
+            is_data, _ = is_data_url(joined)
+            if attr != "src" or not is_data:
+                break
         if not final_src:
             return None
         width = element.get("width", "")
@@ -579,7 +589,8 @@ class ElementExtractor:
             return None
         if len(imgs) == 1:
             return imgs[0]
-        scored: list[tuple[float, Tag]] = []
+        best_img = imgs[0]
+        best_score = None
         for img in imgs:
             score = 0.0
             try:
@@ -596,36 +607,44 @@ class ElementExtractor:
             cls_str = " ".join(cls).lower() if isinstance(cls, list) else str(cls).lower()
             if any(x in cls_str for x in ("icon", "logo", "avatar", "thumbnail")):
                 score -= 5
-            scored.append((score, img))
-        scored.sort(reverse=True, key=lambda x: x[0])
-        return scored[0][1] if scored else imgs[0]
+            if best_score is None or score > best_score:
+                best_img, best_score = img, score
+        return best_img
 
-    def _parse_audio(self, element: Tag, add: bool = True) -> Optional[Audio]:
-        src = element.get("src", "")
-        normalized_src = join_url(self.url, src) if src else ""
+    def _collect_media_sources(self, element: Tag) -> tuple[list[dict[str, str]], list[dict[str, str]]]:
+        url = self.url
         all_sources: list[dict[str, str]] = []
-        for source in element.find_all("source"):
-            for attr_name, attr_value in source.attrs.items():
-                if "src" in attr_name.lower():
-                    all_sources.append({"url": join_url(self.url, attr_value) or "", "type": source.get("type", "")})
         tracks: list[dict[str, str]] = []
-        for track in element.find_all("track"):
-            track_src = track.get("src", "")
-            if track_src:
-                tracks.append({
-                    "url": join_url(self.url, track_src) or "",
-                    "kind": track.get("kind", ""),
-                    "label": track.get("label", ""),
-                    "srclang": track.get("srclang", ""),
-                })
+        for child in element.find_all(("source", "track")):
+            child_attrs = child.attrs
+            if child.name == "source":
+                for attr_name, attr_value in child_attrs.items():
+                    if "src" in attr_name.lower():
+                        all_sources.append({"url": join_url(url, attr_value) or "", "type": child_attrs.get("type", "")})
+            else:
+                track_src = child_attrs.get("src", "")
+                if track_src:
+                    tracks.append({
+                        "url": join_url(url, track_src) or "",
+                        "kind": child_attrs.get("kind", ""),
+                        "label": child_attrs.get("label", ""),
+                        "srclang": child_attrs.get("srclang", ""),
+                    })
+        return all_sources, tracks
+
+    def _parse_audio(self, element: Tag, add: bool = True) -> Optional[Audio]:
+        attrs = element.attrs
+        src = attrs.get("src", "")
+        normalized_src = join_url(self.url, src) if src else ""
+        all_sources, tracks = self._collect_media_sources(element)
         final_src = normalized_src or (all_sources[0]["url"] if all_sources else "")
         if not final_src:
             return None
         metadata = self._create_metadata(element)
         audio_obj = Audio(
-            src=final_src, controls=element.has_attr("controls"),
-            autoplay=element.has_attr("autoplay"), loop=element.has_attr("loop"),
-            muted=element.has_attr("muted"), preload=element.get("preload", ""),
+            src=final_src, controls="controls" in attrs,
+            autoplay="autoplay" in attrs, loop="loop" in attrs,
+            muted="muted" in attrs, preload=attrs.get("preload", ""),
             sources=all_sources, tracks=tracks, metadata=metadata,
         )
         if add:
@@ -634,37 +653,24 @@ class ElementExtractor:
         return audio_obj
 
     def _parse_video(self, element: Tag, add: bool = True) -> Optional[Video]:
-        src = element.get("src", "")
+        attrs = element.attrs
+        src = attrs.get("src", "")
         normalized_src = join_url(self.url, src) if src else ""
-        all_sources: list[dict[str, str]] = []
-        for source in element.find_all("source"):
-            for attr_name, attr_value in source.attrs.items():
-                if "src" in attr_name.lower():
-                    all_sources.append({"url": join_url(self.url, attr_value) or "", "type": source.get("type", "")})
-        poster = element.get("poster", "")
+        all_sources, tracks = self._collect_media_sources(element)
+        poster = attrs.get("poster", "")
         normalized_poster = join_url(self.url, poster) if poster else ""
-        tracks: list[dict[str, str]] = []
-        for track in element.find_all("track"):
-            track_src = track.get("src", "")
-            if track_src:
-                tracks.append({
-                    "url": join_url(self.url, track_src) or "",
-                    "kind": track.get("kind", ""),
-                    "label": track.get("label", ""),
-                    "srclang": track.get("srclang", ""),
-                })
         final_src = normalized_src or (all_sources[0]["url"] if all_sources else "")
         if not final_src:
             return None
         metadata = self._create_metadata(element)
         video_obj = Video(
             src=final_src, poster=normalized_poster or "",
-            width=element.get("width", ""), height=element.get("height", ""),
-            controls=element.has_attr("controls"), autoplay=element.has_attr("autoplay"),
-            loop=element.has_attr("loop"), muted=element.has_attr("muted"),
-            preload=element.get("preload", ""), playsinline=element.has_attr("playsinline"),
+            width=attrs.get("width", ""), height=attrs.get("height", ""),
+            controls="controls" in attrs, autoplay="autoplay" in attrs,
+            loop="loop" in attrs, muted="muted" in attrs,
+            preload=attrs.get("preload", ""), playsinline="playsinline" in attrs,
             sources=all_sources, tracks=tracks,
-            provider=element.get("provider", "unknown"), metadata=metadata,
+            provider=attrs.get("provider", "unknown"), metadata=metadata,
         )
         if add:
             self._add_content(video_obj)
@@ -672,9 +678,10 @@ class ElementExtractor:
         return video_obj
 
     def _join_and_check_url(self, path: str) -> Optional[str]:
+        if path in self._checked_urls:
+            return self._checked_urls[path]
         joined = join_url(base_url=self.url, path=path)
-        if not joined:
-            return None
-        if self.domain_filter.should_block(url=joined):
-            return None
+        if not joined or self.domain_filter.should_block(url=joined):
+            joined = None
+        self._checked_urls[path] = joined
         return joined
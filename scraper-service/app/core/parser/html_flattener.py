@@ -25,6 +25,14 @@ BLOCK_ELEMENTS = {
 
 MEDIA_ELEMENTS = {"img", "video", "audio", "figure", "picture", "embed"}
 
+# Parents the HTML parser closes when a block element starts inside them.
+BLOCK_CLOSING_PARENTS = {"p", "ul"}
+
+# Elements whose contents do not survive serializing and parsing unchanged.
+RAW_TEXT_ELEMENTS = {
+    "iframe", "noembed", "noframes", "plaintext", "script", "style", "template", "textarea", "title", "xmp",
+}
+
 
 class HTMLFlattener:
     def __init__(self, soup: object, url: Optional[str] = None) -> None:
@@ -36,10 +44,16 @@ class HTMLFlattener:
         else:
             raise TypeError("Input must be a string or a BeautifulSoup Tag object.")
         self.md_syntax = True
+        self.requires_reparse = False
 
     def process_html(self) -> str:
+        return str(self.flatten())
+
+    def flatten(self) -> Tag:
+        if any(tag.name in RAW_TEXT_ELEMENTS for tag in self.soup.find_all()):
+            self.requires_reparse = True
         self._flatten_element(self.soup)
-        return str(self.soup)
+        return self.soup
 
     def _flatten_element(self, element: object) -> None:
         for child in list(element.children):  # type: ignore[attr-defined]
@@ -50,6 +64,7 @@ class HTMLFlattener:
                 if child.name in INLINE_ELEMENTS and child.name != "a":
                     if self._has_block_children(child):
                         child.name = "div"
+                        self._check_block_parent(child)
                     else:
                         self._join_inline_children(child)
                 if child.name in BLOCK_ELEMENTS:
@@ -63,8 +78,13 @@ class HTMLFlattener:
         if element.name == "code":
             if len(list(element.descendants)) > 1 and len(element.get_text(strip=True).split(" ")) > 1:
                 element.name = "pre"
+                self._check_block_parent(element)
+                if any(tag.name not in INLINE_ELEMENTS for tag in element.find_all(True)):
+                    self.requires_reparse = True
                 return True
             else:
+                if any(tag.name not in INLINE_ELEMENTS for tag in element.find_all(True, recursive=False)):
+                    self.requires_reparse = True
                 element.unwrap()
         if element.name in MEDIA_ELEMENTS:
             return True
@@ -72,6 +92,11 @@ class HTMLFlattener:
             return True
         return False
 
+    def _check_block_parent(self, element: Tag) -> None:
+        # The HTML parser would close the parent here, so the tree no longer matches its own markup.
+        if element.parent is not None and element.parent.name in BLOCK_CLOSING_PARENTS:
+            self.requires_reparse = True
+
     def _has_block_children(self, element: Tag) -> bool:
         return any(isinstance(child, Tag) and child.name in BLOCK_ELEMENTS for child in element.children)
 
@@ -6,6 +6,27 @@ from urllib.parse import urlparse
 
 from bs4 import BeautifulSoup
 
+_VIDEO_PATTERNS = tuple(
+    (domain, re.compile(path_pattern), domain.split(".")[0])
+    for domain, path_pattern in (
+        ("youtube.com", r"/embed/"),
+        ("youtube-nocookie.com", r"/embed/"),
+        ("youtube.com", r"/watch"),
+        ("player.vimeo.com", r"/video/"),
+        ("vimeo.com", r"/video/"),
+        ("facebook.com", r"/plugins/video"),
+        ("dailymotion.com", r"/embed/video/"),
+        ("player.twitch.tv", r"/?channel=|/?video="),
+        ("instagram.com", r"/p/"),
+        ("tiktok.com", r"/embed"),
+        ("rumble.com", r"/embed/"),
+        ("ted.com", r"/talks/embed"),
+    )
+)
+_CONTENT_HEADER_MARKERS = frozenset(("h1", "h2", "h3", "time"))
+# libxml2 parses these as raw text, so a reparse would not decode the entities bs4 writes into them.
+_RAW_TEXT_TAGS = ("iframe", "noembed", "noframes", "plaintext", "xmp")
+
 
 def _get_soup(html: Union[str, BeautifulSoup]) -> BeautifulSoup:
     if isinstance(html, BeautifulSoup):
@@ -47,11 +68,20 @@ class HtmlTransformer:
         self.register_transformer(name="transform_common_video_iframes", transform_func=self._transform_common_video_iframes)
 
     def broken_tag_fix(self) -> None:
+        if not self._has_escapable_raw_text():
+            return
         try:
             self.soup = BeautifulSoup(str(self.soup), "lxml")
         except Exception:
             pass
 
+    def _has_escapable_raw_text(self) -> bool:
+        for tag in self.soup.find_all(_RAW_TEXT_TAGS):
+            text = tag.get_text()
+            if "&" in text or "<" in text or ">" in text:
+                return True
+        return False
+
     def orphan_li_fixer(self) -> None:
         all_li = self.soup.find_all("li")
         consecutive_orphans: list = []
@@ -101,40 +131,32 @@ class HtmlTransformer:
     def _transform_content_headers(self, soup: BeautifulSoup) -> None:
         for header in soup.find_all("header"):
             if self._is_content_header_tag(header):
-                content_div = soup.new_tag("div")
-                content_div["class"] = "preserved-content"
-                content_div["data-original-tag"] = "header"
-                for child in list(header.children):
-                    content_div.append(child.extract())
-                header.replace_with(content_div)
+                header.name = "div"
+                header.attrs = {"class": "preserved-content", "data-original-tag": "header"}
 
     def _is_content_header_tag(self, header: object) -> bool:
-        if header.find(["h1", "h2", "h3"]):  # type: ignore[attr-defined]
-            return True
-        if header.find("time"):  # type: ignore[attr-defined]
-            return True
-        nav_elements = header.find_all(["nav", "menu"])  # type: ignore[attr-defined]
-        list_elements = header.find_all(["ul", "ol"])  # type: ignore[attr-defined]
-        list_with_links = any(len(ul.find_all("a")) > 2 for ul in list_elements)
-        if (nav_elements or list_with_links) and not header.find(["h1", "h2", "h3", "time"]):  # type: ignore[attr-defined]
+        has_nav = False
+        list_elements = []
+        for element in header.descendants:  # type: ignore[attr-defined]
+            name = element.name
+            if name in _CONTENT_HEADER_MARKERS:
+                return True
+            if name == "nav" or name == "menu":
+                has_nav = True
+            elif name == "ul" or name == "ol":
+                list_elements.append(element)
+        if has_nav:
             return False
+        for list_element in list_elements:
+            link_count = 0
+            for element in list_element.descendants:
+                if element.name == "a":
+                    link_count += 1
+                    if link_count > 2:
+                        return False
         return True
 
     def _transform_common_video_iframes(self, soup: BeautifulSoup) -> None:
-        video_patterns = [
-            {"domain": "youtube.com", "path_pattern": r"/embed/"},
-            {"domain": "youtube-nocookie.com", "path_pattern": r"/embed/"},
-            {"domain": "youtube.com", "path_pattern": r"/watch", "param": "v"},
-            {"domain": "player.vimeo.com", "path_pattern": r"/video/"},
-            {"domain": "vimeo.com", "path_pattern": r"/video/"},
-            {"domain": "facebook.com", "path_pattern": r"/plugins/video"},
-            {"domain": "dailymotion.com", "path_pattern": r"/embed/video/"},
-            {"domain": "player.twitch.tv", "path_pattern": r"/?channel=|/?video="},
-            {"domain": "instagram.com", "path_pattern": r"/p/"},
-            {"domain": "tiktok.com", "path_pattern": r"/embed"},
-            {"domain": "rumble.com", "path_pattern": r"/embed/"},
-            {"domain": "ted.com", "path_pattern": r"/talks/embed"},
-        ]
         for iframe in soup.find_all("iframe"):
             src_attributes = {
                 attr_name: attr_value
@@ -148,10 +170,10 @@ class HtmlTransformer:
                 if parsed_url.scheme in ("http", "https"):
                     domain = parsed_url.netloc
                     path = parsed_url.path
-                    for pattern in video_patterns:
-                        if pattern["domain"] in domain and re.search(pattern["path_pattern"], path):
+                    for pattern_domain, path_pattern, provider in _VIDEO_PATTERNS:
+                        if pattern_domain in domain and path_pattern.search(path):
                             valid_src = attr_value
-                            matched_provider = pattern["domain"].split(".")[0]
+                            matched_provider = provider
                             break
                 if valid_src:
                     break
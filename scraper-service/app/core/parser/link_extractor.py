@@ -5,7 +5,7 @@ import re
 from typing import Any, Optional
 from urllib.parse import urlparse
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 
 from app.utils.url import join_url
 
@@ -18,13 +18,20 @@ MEDIA_EXTENSIONS = {
 
 ARCHIVE_EXTENSIONS = {"zip", "tar", "gz", "bz2", "7z", "rar", "xz"}
 
+_EXTENSION_CATEGORIES: dict[str, str] = {
+    ext: category for category, extensions in MEDIA_EXTENSIONS.items() for ext in extensions
+}
+_EXTENSION_CATEGORIES.update(dict.fromkeys(ARCHIVE_EXTENSIONS, "archives"))
+
 
 class LinkExtractor:
-    def __init__(self, base_url: str, soup: BeautifulSoup) -> None:
+    def __init__(self, base_url: str, soup: BeautifulSoup, anchors: Optional[list[Tag]] = None) -> None:
         self.base_url = base_url
         self.soup = soup
+        self.anchors = anchors
         parsed = urlparse(base_url)
         self.base_domain = parsed.netloc
+        self._subdomain_suffix = f".{self.base_domain}"
 
     def get_all_links(self) -> dict[str, list[dict[str, str]]]:
         links: dict[str, list[dict[str, str]]] = {
@@ -39,8 +46,14 @@ class LinkExtractor:
         }
 
         seen: set[str] = set()
-        for a in self.soup.find_all("a", href=True):
+        seen_hrefs: set[str] = set()
+        anchors = self.anchors if self.anchors is not None else self._find_anchors(self.soup)
+        for a in anchors:
             href = a["href"].strip()
+            # A repeated href resolves to a URL that was already recorded or skipped.
+            if href in seen_hrefs:
+                continue
+            seen_hrefs.add(href)
             full_url = join_url(self.base_url, href)
             if not full_url or full_url in seen:
                 continue
@@ -49,16 +62,16 @@ class LinkExtractor:
             text = a.get_text(strip=True) or ""
             entry = {"url": full_url, "text": text}
 
-            ext = self._get_extension(full_url)
-            category = self._classify_by_extension(ext)
+            parsed = urlparse(full_url)
+            category = self._classify_by_extension(self._path_extension(parsed.path))
             if category:
                 links[category].append(entry)
                 continue
 
-            parsed = urlparse(full_url)
-            if not parsed.scheme or not parsed.netloc:
+            netloc = parsed.netloc
+            if not parsed.scheme or not netloc:
                 links["others"].append(entry)
-            elif parsed.netloc == self.base_domain or parsed.netloc.endswith(f".{self.base_domain}"):
+            elif netloc == self.base_domain or netloc.endswith(self._subdomain_suffix):
                 links["internal"].append(entry)
             else:
                 links["external"].append(entry)
@@ -66,16 +79,13 @@ class LinkExtractor:
         return links
 
     @staticmethod
-    def _get_extension(url: str) -> str:
-        path = urlparse(url).path
-        ext = os.path.splitext(path)[1].lstrip(".").lower()
-        return ext
+    def _find_anchors(soup: BeautifulSoup) -> list[Tag]:
+        return [element for element in soup.descendants if element.name == "a" and element.get("href") is not None]
+
+    @staticmethod
+    def _path_extension(path: str) -> str:
+        return os.path.splitext(path)[1].lstrip(".").lower()
 
     @staticmethod
     def _classify_by_extension(ext: str) -> Optional[str]:
-        if ext in ARCHIVE_EXTENSIONS:
-            return "archives"
-        for category, extensions in MEDIA_EXTENSIONS.items():
-            if ext in extensions:
-                return category
-        return None
+        return _EXTENSION_CATEGORIES.get(ext)
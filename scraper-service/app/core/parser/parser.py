@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass
 from typing import Any, Optional
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 
 from app.core.parser.element_extractor import ElementExtractor
 from app.core.parser.extraction_rules import rules as default_rules
@@ -16,24 +17,21 @@ from app.utils.url import get_url_info
 
 logger = logging.getLogger(__name__)
 
+_MAIN_IMAGE_META_KEYS = ("og:image", "twitter:image", "image", "thumbnail", "msapplication-TileImage")
+_UNWANTED_TAGS = frozenset(("script", "head", "link", "style", "svg", "noscript"))
 
-class ParseResult:
-    __slots__ = (
-        "overview", "organized_data", "structured_data", "text_data",
-        "main_image", "hashes", "links", "content_filter_removal_details",
-        "ai_research_content",
-    )
 
-    def __init__(self) -> None:
-        self.overview: Optional[dict[str, Any]] = None
-        self.organized_data: Any = None
-        self.structured_data: Optional[dict[str, Any]] = None
-        self.text_data: Optional[str] = None
-        self.main_image: Optional[str] = None
-        self.hashes: Optional[list[str]] = None
-        self.links: Optional[dict[str, Any]] = None
-        self.content_filter_removal_details: Optional[list[dict[str, Any]]] = None
-        self.ai_research_content: Optional[str] = None
+@dataclass(slots=True)
+class ParseResult:
+    overview: Optional[dict[str, Any]] = None
+    organized_data: Any = None
+    structured_data: Optional[dict[str, Any]] = None
+    text_data: Optional[str] = None
+    main_image: Optional[str] = None
+    hashes: Optional[list[str]] = None
+    links: Optional[dict[str, Any]] = None
+    content_filter_removal_details: Optional[list[dict[str, Any]]] = None
+    ai_research_content: Optional[str] = None
 
 
 class UnifiedParser:
@@ -57,12 +55,20 @@ class UnifiedParser:
 
         self._filter_unwanted_tags(soup)
 
+        # Page-level details are read before filtering, which then works on the soup in place.
+        if output_mode == OutputMode.RICH and url:
+            title_tag, meta_tags, anchors = self._collect_page_tags(soup)
+            main_image = self._extract_main_image(meta_tags)
+            page_title = title_tag.get_text(strip=True) if title_tag else ""
+            links = LinkExtractor(base_url=url, soup=soup, anchors=anchors).get_all_links()
+
         filter_overrides = content_filter_config or default_overrides
         filtered_soup = self.scrape_filter.filter_soup(
             soup,
             remove=False,
             content_filter_config=filter_overrides,
             main_content_config=main_content_config or [],
+            in_place=True,
         )
 
         if output_mode == OutputMode.RICH:
@@ -82,11 +88,6 @@ class UnifiedParser:
 
             if url:
                 url_info = get_url_info(url)
-                meta_tags = self._extract_meta_tags(soup)
-                main_image = self._extract_main_image(meta_tags)
-                title_tag = soup.find("title")
-                page_title = title_tag.get_text(strip=True) if title_tag else ""
-                links = LinkExtractor(base_url=url, soup=soup).get_all_links()
                 result.links = links
                 result.main_image = main_image
 
@@ -118,8 +119,10 @@ class UnifiedParser:
 
     @staticmethod
     def _filter_unwanted_tags(soup: BeautifulSoup) -> None:
-        for tag_name in ("script", "head", "link", "style", "svg", "noscript"):
-            for tag in soup.find_all(tag_name):
+        unwanted = [element for element in soup.descendants if element.name in _UNWANTED_TAGS]
+        for tag in unwanted:
+            # Tags nested in an already removed subtree were decomposed with it.
+            if not tag.decomposed:
                 tag.decompose()
 
     @staticmethod
@@ -138,27 +141,49 @@ class UnifiedParser:
         return soup, removal_info
 
     @staticmethod
-    def _extract_meta_tags(soup: BeautifulSoup) -> dict[str, Any]:
-        meta_dict: dict[str, Any] = {}
-        for meta in soup.find_all("meta"):
-            meta_key = meta.get("name", meta.get("property"))
-            if not meta_key:
-                meta_key = "unknown"
-            content = meta.get("content", "").strip()
-            if meta_key in meta_dict:
-                existing = meta_dict[meta_key]
-                if isinstance(existing, list):
-                    existing.append(content)
-                else:
-                    meta_dict[meta_key] = [existing, content]
-            else:
-                meta_dict[meta_key] = content
-        return meta_dict
+    def _collect_page_tags(soup: BeautifulSoup) -> tuple[Optional[Tag], list[Tag], list[Tag]]:
+        title_tag: Optional[Tag] = None
+        meta_tags: list[Tag] = []
+        anchors: list[Tag] = []
+        for element in soup.descendants:
+            name = element.name
+            if name == "a":
+                if element.get("href") is not None:
+                    anchors.append(element)
+            elif name == "meta":
+                meta_tags.append(element)
+            elif name == "title" and title_tag is None:
+                title_tag = element
+        return title_tag, meta_tags, anchors
 
     @staticmethod
-    def _extract_main_image(meta_tags: dict[str, Any]) -> Optional[str]:
-        for key in ("og:image", "twitter:image", "image", "thumbnail", "msapplication-TileImage"):
-            if key in meta_tags:
-                val = meta_tags[key]
-                return val[0] if isinstance(val, list) else val
+    def _extract_main_image(meta_tags: list[Tag]) -> Optional[str]:
+        found: dict[str, str] = {}
+        for meta in meta_tags:
+            meta_key = meta.get("name", meta.get("property"))
+            if meta_key in _MAIN_IMAGE_META_KEYS and meta_key not in found:
+                found[meta_key] = meta.get("content", "").strip()
+                if meta_key == _MAIN_IMAGE_META_KEYS[0]:
+                    break
+        for key in _MAIN_IMAGE_META_KEYS:
+            if key in found:
+                return found[key]
         return None
+
+
+_worker_parser: Optional[UnifiedParser] = None
+
+
+def init_parse_worker() -> None:
+    global _worker_parser
+    _worker_parser = UnifiedParser()
+
+
+def parse_html(html: str, url: Optional[str], output_mode: OutputMode) -> ParseResult:
+    """Top-level parse entry point for executor workers; uses one UnifiedParser per process."""
+    if _worker_parser is None:
+        init_parse_worker()
+    result = _worker_parser.parse(html, url, output_mode)
+    # Callers only use the rendered outputs; skip shipping the element tree back.
+    result.organized_data = None
+    return result
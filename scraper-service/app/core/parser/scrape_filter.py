@@ -2,11 +2,21 @@ from __future__ import annotations
 
 import copy
 import re
+from functools import lru_cache
 from typing import Optional
 
 import bs4
 
 VALID_MATCH_TYPES = {"exact", "partial", "regex"}
+PROTECTED_TAGS = frozenset(("ContentFilter", "body", "html"))
+
+
+@lru_cache(maxsize=512)
+def _compile_pattern(value: str) -> Optional[re.Pattern[str]]:
+    try:
+        return re.compile(value)
+    except re.error:
+        return None
 
 
 class ScrapeFilter:
@@ -24,35 +34,56 @@ class ScrapeFilter:
         elif match_type == "partial" and value in text:
             return True
         elif match_type == "regex":
-            try:
-                if re.compile(value).search(text):
-                    return True
-            except re.error:
-                pass
+            pattern = _compile_pattern(value)
+            if pattern is not None and pattern.search(text):
+                return True
         return False
 
-    def _check_class_attribute(self, element: bs4.element.Tag, value: str, match_type: str) -> bool:
-        if not element.has_attr("class"):
-            return False
-        element_classes = element["class"]
+    def _check_class_attribute(
+        self,
+        element: bs4.element.Tag,
+        value: str,
+        match_type: str,
+        element_classes: Optional[list[str]] = None,
+    ) -> bool:
+        if element_classes is None:
+            if not element.has_attr("class"):
+                return False
+            element_classes = element["class"]
         if " " in value:
             return all(vc in element_classes for vc in value.split())
+        if match_type == "exact":
+            return value in element_classes
+        if match_type == "partial":
+            return any(value in cls for cls in element_classes)
         for cls in element_classes:
             if self._check_string_match(cls, value, match_type):
                 return True
         return False
 
-    def _check_style_attribute(self, element: bs4.element.Tag, value: str, match_type: str) -> bool:
-        if not element.has_attr("style"):
-            return False
-        style_str = element["style"].lower().strip()
-        if not style_str:
-            return False
+    @staticmethod
+    def _parse_style(element: bs4.element.Tag) -> dict[str, str]:
         styles: dict[str, str] = {}
-        for s in style_str.split(";"):
+        style_str = element.get("style")
+        if not style_str:
+            return styles
+        for s in style_str.lower().split(";"):
             if ":" in s:
                 k, v = s.split(":", 1)
                 styles[k.strip()] = v.strip()
+        return styles
+
+    def _check_style_attribute(
+        self,
+        element: bs4.element.Tag,
+        value: str,
+        match_type: str,
+        styles: Optional[dict[str, str]] = None,
+    ) -> bool:
+        if styles is None:
+            styles = self._parse_style(element)
+        if not styles:
+            return False
         if ":" in value:
             prop, val = value.split(":", 1)
             if prop.strip() in styles:
@@ -67,6 +98,8 @@ class ScrapeFilter:
         attribute: str,
         values: list[str],
         match_type: str,
+        text: Optional[str] = None,
+        styles: Optional[dict[str, str]] = None,
     ) -> tuple[bool, Optional[str]]:
         if match_type not in VALID_MATCH_TYPES:
             return False, None
@@ -80,7 +113,8 @@ class ScrapeFilter:
             return False, None
 
         if attribute == "text":
-            text = element.get_text(strip=True)
+            if text is None:
+                text = element.get_text(strip=True)
             if not text:
                 return False, None
             for value in values:
@@ -89,14 +123,17 @@ class ScrapeFilter:
             return False, None
 
         if attribute == "class":
+            element_classes = element.get("class")
+            if element_classes is None:
+                return False, None
             for value in values:
-                if self._check_class_attribute(element, value, match_type):
+                if self._check_class_attribute(element, value, match_type, element_classes):
                     return True, value
             return False, None
 
         if attribute == "style":
             for value in values:
-                if self._check_style_attribute(element, value, match_type):
+                if self._check_style_attribute(element, value, match_type, styles):
                     return True, value
             return False, None
 
@@ -118,13 +155,32 @@ class ScrapeFilter:
     def find_main_content(self, soup: bs4.BeautifulSoup) -> Optional[bs4.element.Tag]:
         if not self.main_content_selectors:
             return None
+        elements = soup.select(",".join(self.main_content_selectors))
+        if not elements:
+            return None
         main_content = soup.new_tag("div")
-        found_any = False
+        # One walk finds every candidate; output stays grouped by selector, once per matching selector.
         for selector in self.main_content_selectors:
-            for element in soup.select(selector):
-                found_any = True
-                main_content.append(copy.deepcopy(element))
-        return main_content if found_any else None
+            pattern = soup.css.compile(selector)
+            for element in elements:
+                if pattern.match(element):
+                    main_content.append(copy.deepcopy(element))
+        return main_content
+
+    def _active_filters(self) -> list[tuple[str, list[tuple[str, list[str]]]]]:
+        active_filters: list[tuple[str, list[tuple[str, list[str]]]]] = []
+        for filter_config in self.content_filters:
+            attribute = filter_config.get("attribute")
+            if not attribute:
+                continue
+            checks = [
+                (match_type_str, filter_config[match_type_str])
+                for match_type_str in ("exact", "partial", "regex")
+                if filter_config.get(match_type_str)
+            ]
+            if checks:
+                active_filters.append((attribute, checks))
+        return active_filters
 
     def filter_soup(
         self,
@@ -132,35 +188,41 @@ class ScrapeFilter:
         main_content_config: Optional[list[str]] = None,
         content_filter_config: Optional[list[dict]] = None,
         remove: bool = False,
+        in_place: bool = False,
     ) -> bs4.BeautifulSoup:
         if main_content_config is not None:
             self.main_content_selectors = main_content_config
         if content_filter_config is not None:
             self.content_filters = content_filter_config
 
-        processed_soup = copy.deepcopy(soup)
+        active_filters = self._active_filters()
+        if not active_filters and not self.main_content_selectors:
+            return soup if in_place else copy.deepcopy(soup)
+
+        processed_soup = soup if in_place else copy.deepcopy(soup)
         main_content = self.find_main_content(processed_soup)
         target_soup = main_content if main_content else processed_soup
 
         elements_to_remove: list[bs4.element.Tag] = []
-        protected_tags = {"ContentFilter", "body", "html"}
+        filtered_attributes = {attribute for attribute, _ in active_filters}
+        uses_text = "text" in filtered_attributes
+        uses_style = "style" in filtered_attributes
 
-        for element in target_soup.find_all():
-            if element.name in protected_tags:
+        for element in target_soup.find_all() if active_filters else ():
+            if element.name in PROTECTED_TAGS:
                 continue
             if element.parent and element.parent.name == "ContentFilter":
                 continue
+            # Wrapping never changes an element's text or style, so both are read once for all filters.
+            element_text = element.get_text(strip=True) if uses_text else None
+            element_styles = self._parse_style(element) if uses_style else None
 
-            for filter_config in self.content_filters:
-                attribute = filter_config.get("attribute")
-                if not attribute:
-                    continue
+            for attribute, checks in active_filters:
                 is_match = False
-                for match_type_str in ("exact", "partial", "regex"):
-                    values = filter_config.get(match_type_str, [])
-                    if not values:
-                        continue
-                    is_match, trigger_value = self.check_element(element, attribute, values, match_type_str)
+                for match_type_str, values in checks:
+                    is_match, trigger_value = self.check_element(
+                        element, attribute, values, match_type_str, element_text, element_styles,
+                    )
                     if is_match:
                         if remove:
                             elements_to_remove.append(element)
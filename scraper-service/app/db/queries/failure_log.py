@@ -11,6 +11,43 @@ from app.utils.url import extract_domain
 logger = logging.getLogger(__name__)
 
 
+_INSERT_FAILURE = """
+    INSERT INTO scrape_failure_log
+        (target_url, domain_name, failure_reason, failure_category,
+         status_code, error_log, proxy_used, proxy_type, attempt_count)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+"""
+
+_FAILURE_COLUMNS = (
+    "target_url", "domain_name", "failure_reason", "failure_category",
+    "status_code", "error_log", "proxy_used", "proxy_type", "attempt_count",
+)
+
+FailureRow = tuple[str, str, str, Optional[str], Optional[int], Optional[str], bool, Optional[str], int]
+
+
+def build_failure_row(
+    target_url: str,
+    failure_reason: FailureReason,
+    status_code: Optional[int] = None,
+    error_log: Optional[str] = None,
+    proxy_used: bool = False,
+    proxy_type: Optional[str] = None,
+    attempt_count: int = 1,
+) -> FailureRow:
+    return (
+        target_url,
+        extract_domain(target_url),
+        failure_reason.value,
+        FAILURE_CATEGORY_MAP.get(failure_reason),
+        status_code,
+        error_log,
+        proxy_used,
+        proxy_type,
+        attempt_count,
+    )
+
+
 async def log_failure(
     pool: asyncpg.Pool,
     target_url: str,
@@ -21,26 +58,19 @@ async def log_failure(
     proxy_type: Optional[str] = None,
     attempt_count: int = 1,
 ) -> None:
-    domain_name = extract_domain(target_url)
-    failure_category = FAILURE_CATEGORY_MAP.get(failure_reason)
-
+    row = build_failure_row(
+        target_url, failure_reason, status_code, error_log, proxy_used, proxy_type, attempt_count,
+    )
     try:
         async with pool.acquire() as conn:
-            await conn.execute("""
-                INSERT INTO scrape_failure_log
-                    (target_url, domain_name, failure_reason, failure_category,
-                     status_code, error_log, proxy_used, proxy_type, attempt_count)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-            """,
-                target_url,
-                domain_name,
-                failure_reason.value,
-                failure_category,
-                status_code,
-                error_log,
-                proxy_used,
-                proxy_type,
-                attempt_count,
-            )
+            await conn.execute(_INSERT_FAILURE, *row)
     except Exception:
         logger.exception("Failed to log scrape failure for %s", target_url)
+
+
+async def log_failures(pool: asyncpg.Pool, rows: list[FailureRow]) -> None:
+    try:
+        async with pool.acquire() as conn:
+            await conn.copy_records_to_table("scrape_failure_log", records=rows, columns=_FAILURE_COLUMNS)
+    except Exception:
+        logger.exception("Failed to log %d scrape failures", len(rows))
@@ -60,7 +60,10 @@ class DomainConfigStore:
         return self._domains.get(domain_name)
 
     def is_scrape_allowed(self, url: str) -> bool:
-        config = self.get_domain(url)
+        return self.is_scrape_allowed_domain(extract_domain(url))
+
+    def is_scrape_allowed_domain(self, domain: str) -> bool:
+        config = self._domains.get(domain)
         if config is None:
             return True
         return config.scrape_allowed
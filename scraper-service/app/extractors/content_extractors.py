@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import io
-import json
 import logging
 import re
 from typing import Optional
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -25,6 +26,9 @@ OCR_CONFIG = r"--oem 3 --psm 6"
 OCR_DPI = 300
 OCR_LOW_TEXT_THRESHOLD = 50
 
+_RE_XML_TAG = re.compile(r"<[^>]+>")
+_RE_WHITESPACE = re.compile(r"\s+")
+
 
 def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> Optional[str]:
     if not FITZ_AVAILABLE:
@@ -76,23 +80,20 @@ def extract_text_from_image_bytes(image_bytes: bytes) -> Optional[str]:
 
 def format_json_content(text: str) -> Optional[str]:
     try:
-        parsed = json.loads(text)
-        return json.dumps(parsed, indent=2, ensure_ascii=False)
-    except (json.JSONDecodeError, TypeError):
+        return orjson.dumps(orjson.loads(text), option=orjson.OPT_INDENT_2).decode()
+    except (orjson.JSONDecodeError, TypeError):
         return text if text.strip() else None
 
 
 def extract_xml_text(text: str) -> Optional[str]:
-    cleaned = re.sub(r"<[^>]+>", " ", text)
-    cleaned = re.sub(r"\s+", " ", cleaned).strip()
+    cleaned = _RE_WHITESPACE.sub(" ", _RE_XML_TAG.sub(" ", text)).strip()
     return cleaned if cleaned else None
 
 
 def extract_text_content(text: str, content_type_value: str) -> Optional[str]:
-    if content_type_value in ("md", "txt"):
-        return text.strip() if text.strip() else None
-    elif content_type_value == "json":
+    if content_type_value == "json":
         return format_json_content(text)
-    elif content_type_value == "xml":
+    if content_type_value == "xml":
         return extract_xml_text(text)
-    return text.strip() if text.strip() else None
+    stripped = text.strip()
+    return stripped if stripped else None
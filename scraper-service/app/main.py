@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator, Optional
 
@@ -12,6 +15,7 @@ from app.config import get_settings
 from app.core.fetcher.browser_pool import PlaywrightBrowserPool
 from app.core.fetcher.fetcher import UnifiedFetcher
 from app.core.orchestrator import ScrapeOrchestrator
+from app.core.parser.parser import init_parse_worker
 from app.core.search import BraveSearchClient
 from app.db.connection import close_pool, create_pool
 from app.domain_config.config_store import DomainConfigStore
@@ -26,7 +30,16 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     settings = get_settings()
     logger.info("Starting scraper-service")
 
-    db_pool = await create_pool(settings.DATABASE_URL)
+    db_pool = await create_pool(
+        settings.DATABASE_URL,
+        min_size=settings.DB_POOL_MIN_SIZE,
+        max_size=settings.DB_POOL_MAX_SIZE,
+    )
+    if settings.DB_POOL_MAX_SIZE < settings.MAX_SCRAPE_CONCURRENCY:
+        logger.warning(
+            "DB_POOL_MAX_SIZE (%d) is below MAX_SCRAPE_CONCURRENCY (%d) — scrapes may wait on connections",
+            settings.DB_POOL_MAX_SIZE, settings.MAX_SCRAPE_CONCURRENCY,
+        )
     app.state.db_pool = db_pool
     app.state.settings = settings
 
@@ -62,6 +75,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         search_client = BraveSearchClient(settings)
     app.state.search_client = search_client
 
+    parse_pool = ProcessPoolExecutor(
+        max_workers=settings.PARSE_WORKERS or os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_parse_worker,
+    )
+    app.state.parse_pool = parse_pool
+
     orchestrator = ScrapeOrchestrator(
         fetcher=fetcher,
         settings=settings,
@@ -69,13 +89,17 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         page_cache=page_cache,
         domain_config_store=domain_config_store,
         search_client=search_client,
+        parse_executor=parse_pool,
     )
     app.state.orchestrator = orchestrator
 
     logger.info("Scraper-service started on %s:%d", settings.HOST, settings.PORT)
     yield
 
+    await orchestrator.stop()
+    await page_cache.stop()
     await domain_config_store.stop()
+    parse_pool.shutdown(wait=False, cancel_futures=True)
     if browser_pool:
         await browser_pool.stop()
     await close_pool(db_pool)
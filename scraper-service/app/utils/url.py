@@ -5,13 +5,20 @@ import os
 import re
 from functools import lru_cache
 from typing import Optional
-from urllib.parse import parse_qs, urlencode, urljoin, urlparse, urlunparse
+from urllib.parse import parse_qs, urlencode, urljoin, urlparse, urlsplit, urlunparse
 
 import tldextract
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+
+_KNOWN_SCHEME_RE = re.compile(r"^(?:http|https|ftp|file)://")
+_ANY_SCHEME_RE = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*:")
+_LEADING_SLASHES_RE = re.compile(r"^/{3,}")
+_TRAILING_SLASHES_RE = re.compile(r"/{2,}$")
 
 
 class URLInfo(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     url: str
     website: str
     full_domain: str
@@ -20,7 +27,7 @@ class URLInfo(BaseModel):
     domain_type: str
     unique_page_name: str
     extension: Optional[str] = None
-    path_segments: list[str] = []
+    path_segments: tuple[str, ...] = ()
 
     @classmethod
     def from_url(cls, raw_url: str) -> URLInfo:
@@ -34,7 +41,7 @@ class URLInfo(BaseModel):
         unique_page_name = re.sub(r"[^a-zA-Z0-9]", "_", full_domain + path)
         ext_raw = os.path.splitext(parsed.path)[1][1:]
         extension = ext_raw if ext_raw else None
-        segments = [seg for seg in path.split("/") if seg.strip() and "?" not in seg]
+        segments = tuple(seg for seg in path.split("/") if seg.strip() and "?" not in seg)
 
         return cls(
             url=cleaned,
@@ -49,7 +56,7 @@ class URLInfo(BaseModel):
         )
 
 
-@lru_cache(maxsize=2000)
+@lru_cache(maxsize=4096)
 def get_url_info(url: str) -> URLInfo:
     return URLInfo.from_url(url)
 
@@ -107,6 +114,7 @@ def _construct_path(parsed: object) -> str:
     return path
 
 
+@lru_cache(maxsize=4096)
 def validate_and_correct_url(url: str) -> str:
     if not url:
         raise ValueError("URL cannot be empty")
@@ -172,6 +180,24 @@ def validate_and_correct_url(url: str) -> str:
     return url
 
 
+@lru_cache(maxsize=256)
+def _url_origin(base_url: str) -> Optional[str]:
+    parts = urlsplit(base_url)
+    if parts.scheme in ("http", "https") and parts.netloc:
+        return f"{parts.scheme}://{parts.netloc}"
+    return None
+
+
+def _join_root_relative(base_url: str, path: str) -> Optional[str]:
+    origin = _url_origin(base_url)
+    if origin is None or path.endswith(("?", "#")) or "?#" in path:
+        return None
+    head = path.partition("#")[0].partition("?")[0]
+    if "//" in head or "/." in head or ";" in head or any(ch in path for ch in "\t\r\n"):
+        return None
+    return origin + path
+
+
 def join_url(base_url: Optional[str], path: Optional[str]) -> Optional[str]:
     if base_url is None:
         return path
@@ -182,24 +208,27 @@ def join_url(base_url: Optional[str], path: Optional[str]) -> Optional[str]:
     if not path:
         return base_url
 
-    if re.match(r"^(?:http|https|ftp|file)://", path):
+    if _KNOWN_SCHEME_RE.match(path):
         return path
 
     if path.startswith("data:"):
         return path
 
-    if re.match(r"^[a-zA-Z][a-zA-Z0-9+.-]*:", path):
+    if _ANY_SCHEME_RE.match(path):
         return path
 
     if path.startswith("//") and not path.startswith("///"):
         parsed_base = urlparse(base_url)
         return f"{parsed_base.scheme}:{path}"
 
-    if re.match(r"^/{3,}", path):
+    if _LEADING_SLASHES_RE.match(path):
         path = "/" + path.lstrip("/")
 
-    trailing = re.search(r"/{2,}$", base_url)
-    if trailing and not path.startswith("/"):
+    if path.startswith("/"):
+        joined = _join_root_relative(base_url, path)
+        if joined is not None:
+            return joined
+    elif _TRAILING_SLASHES_RE.search(base_url):
         return base_url + path
 
     return urljoin(base_url, path)
@@ -23,17 +23,23 @@ TEST_API_KEY = "test-api-key-123"
 TEST_JWKS_URL = "https://example.supabase.co/auth/v1/.well-known/jwks.json"
 
 
-class _MockAcquireContext:
-    def __init__(self, conn: AsyncMock) -> None:
-        self._conn = conn
+class _AsyncContext:
+    def __init__(self, value: object = None) -> None:
+        self._value = value
 
-    async def __aenter__(self) -> AsyncMock:
-        return self._conn
+    async def __aenter__(self) -> object:
+        return self._value
 
     async def __aexit__(self, *args: object) -> None:
         pass
 
 
+def _make_mock_pool(conn: object) -> MagicMock:
+    pool = MagicMock()
+    pool.acquire = MagicMock(return_value=_AsyncContext(conn))
+    return pool
+
+
 def _make_settings(*, jwks_url: str = "") -> Settings:
     return Settings(
         API_KEY=TEST_API_KEY,
@@ -79,18 +85,19 @@ async def app_client() -> AsyncGenerator[AsyncClient, None]:
     mock_conn.fetchrow = AsyncMock(return_value=None)
     mock_conn.execute = AsyncMock()
 
-    mock_pool = MagicMock()
-    mock_pool.acquire = MagicMock(return_value=_MockAcquireContext(mock_conn))
+    mock_pool = _make_mock_pool(mock_conn)
 
     mock_fetcher = MagicMock(spec=UnifiedFetcher)
     mock_fetcher.fetch_with_retry = AsyncMock(return_value=_make_mock_fetch_response())
 
     mock_domain_store = MagicMock(spec=DomainConfigStore)
     mock_domain_store.is_scrape_allowed = MagicMock(return_value=True)
+    mock_domain_store.is_scrape_allowed_domain = MagicMock(return_value=True)
     mock_domain_store.all_domains = []
 
     mock_cache = MagicMock(spec=PageCache)
     mock_cache.get = AsyncMock(return_value=None)
+    mock_cache.get_many = AsyncMock(return_value={})
     mock_cache.set = AsyncMock()
 
     mock_search_client = MagicMock(spec=BraveSearchClient)
@@ -143,18 +150,19 @@ def _build_jwt_client_app(settings: Settings) -> Any:
     mock_conn.fetchrow = AsyncMock(return_value=None)
     mock_conn.execute = AsyncMock()
 
-    mock_pool = MagicMock()
-    mock_pool.acquire = MagicMock(return_value=_MockAcquireContext(mock_conn))
+    mock_pool = _make_mock_pool(mock_conn)
 
     mock_fetcher = MagicMock(spec=UnifiedFetcher)
     mock_fetcher.fetch_with_retry = AsyncMock(return_value=_make_mock_fetch_response())
 
     mock_domain_store = MagicMock(spec=DomainConfigStore)
     mock_domain_store.is_scrape_allowed = MagicMock(return_value=True)
+    mock_domain_store.is_scrape_allowed_domain = MagicMock(return_value=True)
     mock_domain_store.all_domains = []
 
     mock_cache = MagicMock(spec=PageCache)
     mock_cache.get = AsyncMock(return_value=None)
+    mock_cache.get_many = AsyncMock(return_value={})
     mock_cache.set = AsyncMock()
 
     mock_search_client = MagicMock(spec=BraveSearchClient)
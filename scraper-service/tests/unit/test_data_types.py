@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import pytest
+from tabulate import tabulate
+
+from app.core.parser.data_types import ExtractionSettings, Header, Image, OrganizedData, Table, TextContent, _format_text_table
+from app.core.parser.extraction_rules import rules
+
+TEXT_ROWS = [
+    {"Name": "Widget", "Notes": "  ships in a box ", "Empty": ""},
+    {"Name": "Gadget with a long name", "Notes": "", "Empty": ""},
+]
+
+
+@pytest.mark.parametrize(("with_rule", "fmt"), [(True, "simple"), (False, "plain")])
+def test_text_table_matches_tabulate(with_rule: bool, fmt: str) -> None:
+    assert _format_text_table(TEXT_ROWS, with_rule) == tabulate(TEXT_ROWS, tablefmt=fmt, headers="keys")
+
+
+def test_numeric_or_non_ascii_tables_fall_back() -> None:
+    assert _format_text_table([{"Name": "a", "Price": "1,200.50"}, {"Name": "b", "Price": "3"}], True) is None
+    assert _format_text_table([{"Name": "café"}], True) is None
+    assert _format_text_table([{"Name": "two\nlines"}], True) is None
+
+
+def test_table_rows_keep_source_column_order() -> None:
+    table = Table(content=[
+        {"Name": [TextContent(content="alpha")], "Value": [TextContent(content="1")]},
+        {"Name": [TextContent(content="beta")], "Value": [TextContent(content="2")], "Notes": [TextContent(content="x")]},
+    ])
+    rows = table.to_data(ExtractionSettings(["table"], ["data"]))["rows"]
+    assert [list(row) for row in rows] == [["Name", "Value", "Notes"]] * 2
+    assert rows[0]["Notes"] == ""
+
+
+def test_extract_matches_rule_by_rule_extraction() -> None:
+    inner = Header(level=2, text="Inner", content=[TextContent(content="nested text")])
+    data = OrganizedData(content=[
+        TextContent(content="intro"),
+        Header(level=1, text="Outer", content=[TextContent(content="body"), inner]),
+    ])
+    duplicated = rules + [dict(rules[3], name="markdown_copy")]
+    output = data.extract(duplicated)
+    assert output == {rule["name"]: data._extract_by_rule(rule) for rule in duplicated}
+    assert output["markdown_renderable_by_header"]["Outer"] == "# Outer\nbody\n## Inner\nnested text"
+
+
+def test_rules_with_the_same_settings_get_separate_results() -> None:
+    data = OrganizedData(content=[Header(level=1, text="Outer", content=[TextContent(content="body")])])
+    data_rule = {"name": "data", "allowed_children": ["header", "text"], "options": ["data"]}
+    by_header = {"name": "by_header", "allowed_children": ["text"], "options": ["content", "organize_content_by_headers"]}
+    output = data.extract([data_rule, dict(data_rule, name="data_copy"), by_header, dict(by_header, name="by_header_copy")])
+
+    assert output["data"] == output["data_copy"]
+    output["data"][0]["content"] = "changed"
+    assert output["data_copy"][0]["content"] == "Outer"
+    output["by_header"]["Outer"] = "changed"
+    assert output["by_header_copy"]["Outer"] == "# Outer\nbody"
+
+
+def test_image_srcset_is_deduplicated_in_source_order() -> None:
+    image = Image(src="https://example.com/a.png", all_sources=["https://example.com/b.png", "https://example.com/a.png", "https://example.com/b.png"])
+    srcset = image.to_data(ExtractionSettings(["image"], ["data"]))["srcset"]
+    assert srcset == ["https://example.com/b.png", "https://example.com/a.png"]
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import pytest
+from bs4 import BeautifulSoup
+
+from app.core.parser.element_extractor import ElementExtractor
+from app.core.parser.extraction_rules import rules
+from app.core.parser.html_flattener import HTMLFlattener
+
+PAGES = [
+    "<html><body><h1>Title</h1><p>one <!-- note --> two <b>bold</b> <a href='/x'>link</a></p>"
+    "<ul><li>a<span>b</span></li><li><code>x = 1 + 2</code></li></ul></body></html>",
+    "<html><body><p>intro<span><div>block in span</div></span> tail</p>"
+    "<p><code><span>def</span> <span>f():</span><ul><li>item</li></ul></code></p></body></html>",
+    "<html><body><textarea>&lt;div class=\"x\"&gt;Hi&lt;/div&gt;</textarea></body></html>",
+    "<html><body><p>a<xmp><b>x</b> &amp; y</xmp></p></body></html>",
+]
+
+
+def _extract(html: str) -> dict:
+    soup = BeautifulSoup(html, "lxml")
+    return ElementExtractor().extract_content(soup, url="https://example.com/")["organized_data"].extract(rules)
+
+
+@pytest.mark.parametrize("html", PAGES)
+def test_flattened_tree_matches_reparsed_tree(html: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    direct = _extract(html)
+
+    flatten = HTMLFlattener.flatten
+
+    def flatten_and_reparse(self: HTMLFlattener):
+        flattened = flatten(self)
+        self.requires_reparse = True
+        return flattened
+
+    monkeypatch.setattr(HTMLFlattener, "flatten", flatten_and_reparse)
+    assert direct == _extract(html)
+
+
+def test_raw_text_elements_keep_reparsed_output() -> None:
+    textarea = _extract(PAGES[2])
+    assert textarea["organized_data"][1]["content"] == (
+        "<span class=\"flattened-text\" fmt-txt='<div class=\"x\">Hi</div>'><div class=\"x\">Hi</div></span>"
+    )
+    xmp = _extract(PAGES[3])
+    assert xmp["organized_data"][2]["content"] == "&lt;b&gt;x&lt;/b&gt; &amp;amp; y"
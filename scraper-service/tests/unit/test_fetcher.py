@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from app.core.fetcher.fetcher import UnifiedFetcher, _detect_content_type_from_url, _is_retryable_failure
+from app.core.fetcher.models import FetchResponse
+from app.core.fetcher.profiles import get_random_profile
+from app.models.enums import CMS, ContentType, FailureReason, Firewall, RequestType
+from tests.conftest import _make_settings
+
+WP_PAGE = (
+    "<html><head><title>Blog</title><meta name='generator' content='WordPress 6.4'></head>"
+    "<body><script src='/wp-includes/js/x.js'></script><script src='https://cdn.shopify.com/s.js'></script>"
+    "<p>" + "Some paragraph text. " * 20 + "</p></body></html>"
+)
+
+
+def _response(failed_reasons: list[tuple[str, str]]) -> FetchResponse:
+    return FetchResponse(
+        request_url="https://example.com",
+        response_url="https://example.com",
+        proxy_used=False,
+        request_type=RequestType.NORMAL,
+        content_type=ContentType.HTML,
+        failed=bool(failed_reasons),
+        failed_reasons=failed_reasons,
+    )
+
+
+def test_retryable_failure() -> None:
+    resp = _response([(FailureReason.LOW_TEXT_CONTENT.value, "x"), (FailureReason.BAD_STATUS.value, "Status code 503")])
+    assert _is_retryable_failure(resp)
+
+
+def test_non_retryable_failure() -> None:
+    assert not _is_retryable_failure(_response([(FailureReason.CLOUDFLARE_BLOCK.value, "Selector: #cf")]))
+    assert not _is_retryable_failure(_response([]))
+
+
+def test_detect_content_type_from_url() -> None:
+    assert _detect_content_type_from_url("https://example.com/report.PDF?x=1") == ContentType.PDF
+    assert _detect_content_type_from_url("https://example.com/page") is None
+    assert _detect_content_type_from_url("https://a.com/doc.pdf;jsessionid=1") == ContentType.PDF
+    assert _detect_content_type_from_url("https://a.com/doc.pdf;v=1/") is None
+    assert _detect_content_type_from_url("x.pdf") == ContentType.PDF
+    assert _detect_content_type_from_url("mailto:x@y.pdf") == ContentType.PDF
+    assert _detect_content_type_from_url("https://a.com/go/https://b.com/") is None
+    assert _detect_content_type_from_url("//cdn.pdf") is None
+    assert _detect_content_type_from_url("https://a.com/re\tport.pdf") == ContentType.PDF
+    assert _detect_content_type_from_url("http://[::1/doc.pdf") is None
+
+
+@pytest.mark.asyncio
+async def test_fetch_detects_cms_and_firewall(httpx_mock: HTTPXMock) -> None:
+    httpx_mock.add_response(
+        url="https://example.com/post",
+        text=WP_PAGE,
+        headers={"content-type": "text/html; charset=utf-8", "server": "cloudflare"},
+    )
+    fetcher = UnifiedFetcher(_make_settings())
+    resp = await fetcher.fetch("https://example.com/post", use_curl_cffi=False, header_profile=get_random_profile())
+    assert not resp.failed
+    assert resp.content_type == ContentType.HTML
+    assert resp.title == "Blog"
+    assert resp.cms_primary == CMS.WORDPRESS
+    assert resp.cms_other == [CMS.SHOPIFY]
+    assert resp.firewall == Firewall.CLOUDFLARE
+
+
+@pytest.mark.asyncio
+async def test_fetch_sniffs_html_only_for_ambiguous_types(httpx_mock: HTTPXMock) -> None:
+    httpx_mock.add_response(url="https://example.com/a", text=WP_PAGE, headers={"content-type": "application/octet-stream"})
+    httpx_mock.add_response(url="https://example.com/b.js", text=WP_PAGE, headers={"content-type": "text/javascript"})
+    fetcher = UnifiedFetcher(_make_settings())
+    sniffed = await fetcher.fetch("https://example.com/a", use_curl_cffi=False)
+    trusted = await fetcher.fetch("https://example.com/b.js", use_curl_cffi=False)
+    assert sniffed.content_type == ContentType.HTML
+    assert trusted.content_type == ContentType.OTHER
+    assert trusted.failed_primary_reason == FailureReason.NON_HTML_CONTENT
+
+
+@pytest.mark.asyncio
+async def test_fetch_resolves_dates_from_meta_and_ld_json(httpx_mock: HTTPXMock) -> None:
+    page = WP_PAGE.replace(
+        "</head>",
+        "<meta name='date' content='2024-01-05'>"
+        "<script type='application/ld+json'>[{\"@type\": \"Thing\"}]</script>"
+        "<script type='application/ld+json'>{\"@graph\": [{\"datePublished\": \"2023-01-01\"},"
+        " {\"dateModified\": \"2024-02-02T10:00:00Z\"}]}</script></head>",
+    )
+    httpx_mock.add_response(url="https://example.com/post", text=page, headers={"content-type": "text/html"})
+    resp = await UnifiedFetcher(_make_settings()).fetch("https://example.com/post", use_curl_cffi=False)
+    assert resp.published_at == "2024-01-05T00:00:00"
+    assert resp.modified_at == "2024-02-02T10:00:00+00:00"
+
+
+@pytest.mark.asyncio
+async def test_fetch_keeps_raw_bytes_for_unlabelled_pdf(httpx_mock: HTTPXMock) -> None:
+    body = b"%PDF-1.7\n\xe2\x80\x93\xff binary"
+    httpx_mock.add_response(url="https://example.com/file", content=body, headers={"content-type": "application/octet-stream"})
+    resp = await UnifiedFetcher(_make_settings()).fetch("https://example.com/file", use_curl_cffi=False)
+    assert resp.content_type == ContentType.PDF
+    assert resp.content_bytes == body
+
+
+@pytest.mark.asyncio
+async def test_fetch_checks_a_prefix_of_oversized_pages(httpx_mock: HTTPXMock, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("app.core.fetcher.fetcher.MAX_PARSE_CHARS", len(WP_PAGE))
+    challenge = "<html><head><title>Just a moment...</title></head><body>" + "x" * len(WP_PAGE) + "</body></html>"
+    httpx_mock.add_response(url="https://example.com/big", text=WP_PAGE + "<p>tail</p>" * 10, headers={"content-type": "text/html"})
+    httpx_mock.add_response(url="https://example.com/blocked", text=challenge, headers={"content-type": "text/html"})
+    fetcher = UnifiedFetcher(_make_settings())
+
+    big = await fetcher.fetch("https://example.com/big", use_curl_cffi=False)
+    assert big.parse_truncated
+    assert not big.failed
+    assert big.title == "Blog"
+    assert big.cms_primary == CMS.WORDPRESS
+
+    blocked = await fetcher.fetch("https://example.com/blocked", use_curl_cffi=False)
+    assert blocked.parse_truncated
+    assert blocked.failed_primary_reason == FailureReason.CLOUDFLARE_BLOCK
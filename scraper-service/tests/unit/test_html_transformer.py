@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+import pytest
+from bs4 import BeautifulSoup
+
+from app.core.parser.html_transformer import HtmlTransformer
+
+
+@pytest.mark.parametrize("html", [
+    "<p>one<p>two <b>bold<i>both</b> italic</i><li>orphan</li>",
+    "<table>stray<tr><td>a<td>b</table><form><form><input></form>",
+    "<iframe>fallback text</iframe><noscript><p>x</p></noscript>",
+    "<iframe><p>a &amp; b</p></iframe><xmp><b></xmp>",
+])
+def test_broken_tag_fix_matches_reparse(html: str) -> None:
+    transformer = HtmlTransformer(html)
+    transformer.broken_tag_fix()
+    assert str(transformer.soup) == str(BeautifulSoup(str(BeautifulSoup(html, "lxml")), "lxml"))
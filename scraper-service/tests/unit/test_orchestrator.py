@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.orchestrator import ScrapeOrchestrator, _format_failed_reasons, _result_from_cache
+from app.db.queries.failure_log import build_failure_row
+from app.models.enums import FailureReason
+from tests.conftest import _make_mock_pool, _make_settings
+
+
+def _make_orchestrator() -> tuple[ScrapeOrchestrator, MagicMock]:
+    conn = MagicMock()
+    conn.copy_records_to_table = AsyncMock()
+    orchestrator = ScrapeOrchestrator(
+        fetcher=MagicMock(),
+        settings=_make_settings(),
+        db_pool=_make_mock_pool(conn),
+        page_cache=MagicMock(),
+        domain_config_store=MagicMock(),
+    )
+    return orchestrator, conn
+
+
+@pytest.mark.asyncio
+async def test_failures_are_written_in_one_batch() -> None:
+    orchestrator, conn = _make_orchestrator()
+    for i in range(5):
+        orchestrator._queue_failure(build_failure_row(f"https://example.com/{i}", FailureReason.BAD_STATUS, 503))
+    await orchestrator.stop()
+
+    conn.copy_records_to_table.assert_awaited_once()
+    assert conn.copy_records_to_table.await_args.args == ("scrape_failure_log",)
+    rows = conn.copy_records_to_table.await_args.kwargs["records"]
+    assert [row[0] for row in rows] == [f"https://example.com/{i}" for i in range(5)]
+    assert rows[0][1:5] == ("example.com", "bad_status", "bad_status", 503)
+
+
+@pytest.mark.asyncio
+async def test_stop_without_failures() -> None:
+    orchestrator, conn = _make_orchestrator()
+    await orchestrator.stop()
+    conn.copy_records_to_table.assert_not_awaited()
+
+
+def test_cached_text_result_aliases_research_content() -> None:
+    text = _result_from_cache("https://example.com/a.pdf", {"content": {"text_data": "pdf text"}, "content_type": "pdf"})
+    assert text.ai_research_content == "pdf text"
+
+    html = _result_from_cache("https://example.com", {"content": {"text_data": "# md"}, "content_type": "html"})
+    assert html.ai_research_content is None
+
+
+def test_failed_reasons_keep_their_error_text() -> None:
+    reasons = [(FailureReason.BAD_STATUS.value, "Status code 503"), (FailureReason.LOW_TEXT_CONTENT.value, "Text length 0")]
+    assert _format_failed_reasons(reasons) == (
+        "[{'bad_status': 'Status code 503'}, {'low_text_content': 'Text length 0'}]"
+    )
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.cache.page_cache import PageCache
+from tests.conftest import _AsyncContext, _make_mock_pool
+
+
+def _make_cache() -> tuple[PageCache, MagicMock]:
+    conn = MagicMock()
+    conn.execute = AsyncMock()
+    conn.executemany = AsyncMock()
+    conn.transaction = MagicMock(return_value=_AsyncContext())
+    return PageCache(_make_mock_pool(conn)), conn
+
+
+@pytest.mark.asyncio
+async def test_deferred_sets_are_written_in_one_batch() -> None:
+    cache, conn = _make_cache()
+    for i in range(3):
+        await cache.set(f"page_{i}", f"https://example.com/{i}", "example.com", {"text_data": "v1"}, "html", 2, defer=True)
+    await cache.set("page_0", "https://example.com/0", "example.com", {"text_data": "v2"}, "html", 2, defer=True)
+
+    assert (await cache.get("page_0"))["content"] == {"text_data": "v2"}
+    conn.executemany.assert_not_awaited()
+
+    await cache.stop()
+    conn.executemany.assert_awaited_once()
+    rows = conn.executemany.await_args.args[1]
+    assert [row[0] for row in rows] == ["page_0", "page_1", "page_2"]
+    assert json.loads(rows[0][5]) == {"text_data": "v2"}
+    assert conn.execute.await_args.args[1] == ["page_0", "page_1", "page_2"]
+
+
+@pytest.mark.asyncio
+async def test_set_writes_immediately_and_raises() -> None:
+    cache, conn = _make_cache()
+    await cache.set("page_0", "https://example.com/0", "example.com", {"text_data": "v1"}, "html", 2, defer=True)
+    await cache.set("page_0", "https://example.com/0", "example.com", {"text_data": "v2"}, "html", 2)
+
+    conn.executemany.assert_awaited_once()
+    assert json.loads(conn.executemany.await_args.args[1][0][5]) == {"text_data": "v2"}
+    await cache.stop()
+    conn.executemany.assert_awaited_once()
+
+    conn.executemany.side_effect = RuntimeError("db down")
+    with pytest.raises(RuntimeError):
+        await cache.set("page_1", "https://example.com/1", "example.com", {"text_data": "v1"}, "html", 2)
+    assert "page_1" not in cache._memory
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried_row_by_row() -> None:
+    cache, conn = _make_cache()
+    written: list[str] = []
+
+    async def executemany(query: str, rows: list[tuple]) -> None:
+        if len(rows) > 1 or rows[0][0] == "page_1":
+            raise RuntimeError("bad row")
+        written.append(rows[0][0])
+
+    conn.executemany.side_effect = executemany
+    for i in range(3):
+        await cache.set(f"page_{i}", f"https://example.com/{i}", "example.com", {"text_data": "v1"}, "html", 2, defer=True)
+    await cache.stop()
+
+    assert written == ["page_0", "page_2"]
+    assert conn.executemany.await_count == 4
+    assert not cache._pending
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_pending_write() -> None:
+    cache, conn = _make_cache()
+    await cache.set("page_0", "https://example.com/0", "example.com", {"text_data": "v1"}, "html", 2, defer=True)
+    await cache.invalidate("page_0")
+    await cache.stop()
+    conn.executemany.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_invalidate_during_flush_runs_after_the_batch() -> None:
+    cache, conn = _make_cache()
+    calls: list[str] = []
+    batch_started = asyncio.Event()
+    release_batch = asyncio.Event()
+
+    async def executemany(query: str, rows: list[tuple]) -> None:
+        batch_started.set()
+        await release_batch.wait()
+        calls.append("insert")
+
+    async def execute(query: str, *args: object) -> None:
+        if "'invalid'" in query:
+            calls.append("invalidate")
+
+    conn.executemany.side_effect = executemany
+    conn.execute.side_effect = execute
+    await cache.set("page_0", "https://example.com/0", "example.com", {"text_data": "v1"}, "html", 2, defer=True)
+    flush = asyncio.create_task(cache.stop())
+    await batch_started.wait()
+
+    invalidate = asyncio.create_task(cache.invalidate("page_0"))
+    await asyncio.sleep(0)
+    release_batch.set()
+    await asyncio.gather(flush, invalidate)
+
+    assert calls == ["insert", "invalidate"]
+    assert "page_0" not in cache._memory
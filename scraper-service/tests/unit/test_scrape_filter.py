@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from bs4 import BeautifulSoup
+
+from app.core.parser.scrape_filter import ScrapeFilter
+
+
+def _main_content(html: str, selectors: list[str]) -> list[str]:
+    scrape_filter = ScrapeFilter()
+    scrape_filter.main_content_selectors = selectors
+    main_content = scrape_filter.find_main_content(BeautifulSoup(html, "lxml"))
+    return [str(child) for child in main_content.children]
+
+
+def test_main_content_follows_selector_order() -> None:
+    html = "<body><div id='intro'>a</div><main>b</main><aside>c</aside></body>"
+    assert _main_content(html, ["main", "#intro"]) == ["<main>b</main>", '<div id="intro">a</div>']
+
+
+def test_overlapping_selectors_duplicate_content() -> None:
+    html = "<body><main class='body'><section>b</section></main></body>"
+    assert _main_content(html, ["main", ".body", "section"]) == [
+        '<main class="body"><section>b</section></main>',
+        '<main class="body"><section>b</section></main>',
+        "<section>b</section>",
+    ]
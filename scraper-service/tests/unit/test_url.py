@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from urllib.parse import urljoin
+
+import pytest
+
+from app.utils.url import join_url
+
+BASE = "https://Example.com/blog/post/?page=2#top"
+
+
+@pytest.mark.parametrize("path", [
+    "/img/a.png",
+    "/img/a.png?w=300&h=200",
+    "/img/a.png#frag",
+    "/img/a.png?",
+    "/img/a.png?#frag",
+    "/img/../a.png",
+    "/img/./a.png",
+    "/img//a.png",
+    "/img/a;v=1.png",
+    "/img/a\tb.png",
+])
+def test_root_relative_paths_match_urljoin(path: str) -> None:
+    assert join_url(BASE, path) == urljoin(BASE, path)
+
+
+def test_relative_paths_keep_existing_behaviour() -> None:
+    assert join_url(BASE, "a.png") == "https://Example.com/blog/post/a.png"
+    assert join_url("https://example.com//", "a.png") == "https://example.com//a.png"
+    assert join_url(BASE, "//cdn.example.com/a.png") == "https://cdn.example.com/a.png"
+    assert join_url(BASE, "////a.png") == "https://Example.com/a.png"